@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from app.core.deps import get_db, get_current_user
 from app.models.models import User, BulkJob, VerificationHistory
-from app.services.email_verifier import email_verifier
+from app.services.email_verifier import email_verifier, VERIFICATION_DEPTHS, DEFAULT_DEPTH, VERIFICATION_MODES, DEFAULT_MODE
 from app.services.credit_manager import CreditManager
+from app.services.syntax_validator import syntax_validator
+from app.core.serialization import dumps
 from app.tasks import process_bulk_job
 from typing import List, Dict, Any, Optional
+import math
 import uuid
 import structlog
 from datetime import datetime
@@ -16,23 +19,67 @@ logger = structlog.get_logger()
 
 from pydantic import BaseModel, EmailStr, validator
 
+# Credits per address for each verification depth. Balances are whole credits: bulk totals
+# are rounded up and every request costs at least 1, so a single syntax / dns / cached_only
+# call costs the same 1 credit as a standard one
+DEPTH_CREDIT_RATES = {
+    'syntax': 0.1,
+    'dns': 0.25,
+    'standard': 1,
+    'deep': 2,
+}
+# cached_only answers from cached data: never more than a syntax check (subject to the same floor)
+CACHED_ONLY_CREDIT_RATE = 0.1
+
+
+def _depth_cost(depth: str, count: int = 1, mode: str = DEFAULT_MODE) -> int:
+    rate = DEPTH_CREDIT_RATES[depth]
+    if mode == 'cached_only':
+        rate = min(rate, CACHED_ONLY_CREDIT_RATE)
+    return max(1, math.ceil(count * rate))
+
+
+def _validate_depth(v):
+    if v not in VERIFICATION_DEPTHS:
+        raise ValueError(f"depth must be one of: {', '.join(VERIFICATION_DEPTHS)}")
+    return v
+
+
+def _validate_mode(v):
+    if v not in VERIFICATION_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(VERIFICATION_MODES)}")
+    return v
+
+
 class VerifyRequest(BaseModel):
     email: EmailStr
+    depth: str = DEFAULT_DEPTH
+    mode: str = DEFAULT_MODE
+    
+    @validator('depth')
+    def validate_depth(cls, v):
+        return _validate_depth(v)
+    
+    @validator('mode')
+    def validate_mode(cls, v):
+        return _validate_mode(v)
 
 class BulkVerifyRequest(BaseModel):
     emails: List[str]
+    depth: str = DEFAULT_DEPTH
+    mode: str = DEFAULT_MODE
+    
+    @validator('depth')
+    def validate_depth(cls, v):
+        return _validate_depth(v)
+    
+    @validator('mode')
+    def validate_mode(cls, v):
+        return _validate_mode(v)
     
     @validator('emails')
     def validate_emails(cls, v):
-        import re
-        email_re = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
-        cleaned = []
-        seen = set()
-        for e in v:
-            e = e.strip()
-            if email_re.match(e) and e.lower() not in seen:
-                seen.add(e.lower())
-                cleaned.append(e)
+        cleaned = syntax_validator.clean_list(v)
         if len(cleaned) == 0:
             raise ValueError('At least 1 valid email required')
         if len(cleaned) > 100000:
@@ -69,18 +116,20 @@ async def verify_single(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    cost = _depth_cost(req.depth, mode=req.mode)
     cm = CreditManager()
-    if not cm.has_sufficient_credits(db, current_user.id, 1):
+    if not cm.has_sufficient_credits(db, current_user.id, cost):
         raise HTTPException(status_code=402, detail="Insufficient credits")
     
     try:
-        cm.deduct_credits(db, current_user.id, 1, "single_verification", {"email": req.email})
-        result = await email_verifier.verify_email(req.email)
+        cm.deduct_credits(db, current_user.id, cost, "single_verification",
+                          {"email": req.email, "depth": req.depth, "mode": req.mode})
+        result = await email_verifier.verify_email(req.email, depth=req.depth, mode=req.mode)
         
         # Save to history
         _save_to_history(db, current_user.id, result, source="single")
         
-        return result
+        return Response(content=dumps(result), media_type="application/json")
     except Exception as e:
         logger.error("verification_failed", error=str(e))
         raise HTTPException(status_code=500, detail="Verification failed")
@@ -96,12 +145,14 @@ async def verify_bulk(
     if count == 0:
         raise HTTPException(status_code=400, detail="No emails provided")
         
+    cost = _depth_cost(req.depth, count, req.mode)
     cm = CreditManager()
-    if not cm.has_sufficient_credits(db, current_user.id, count):
+    if not cm.has_sufficient_credits(db, current_user.id, cost):
         raise HTTPException(status_code=402, detail="Insufficient credits")
         
     try:
-        cm.deduct_credits(db, current_user.id, count, "bulk_verification", {"count": count})
+        cm.deduct_credits(db, current_user.id, cost, "bulk_verification",
+                          {"count": count, "depth": req.depth, "mode": req.mode})
         
         job_id = str(uuid.uuid4())
         job = BulkJob(
@@ -115,12 +166,15 @@ async def verify_bulk(
         db.add(job)
         db.commit()
         
-        process_bulk_job.delay(job_id, req.emails, current_user.id)
+        process_bulk_job.delay(job_id, req.emails, current_user.id, req.depth, mode=req.mode)
         
         return {
             "job_id": job_id,
             "status": "processing",
-            "total_emails": count
+            "total_emails": count,
+            "depth": req.depth,
+            "mode": req.mode,
+            "credits_used": cost
         }
     except Exception as e:
         logger.error("bulk_verification_failed", error=str(e))
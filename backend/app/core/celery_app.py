@@ -3,6 +3,7 @@ Celery configuration for async task processing
 """
 
 from celery import Celery
+from app.core.serialization import CELERY_ACCEPT_CONTENT, CELERY_SERIALIZER, register_celery_serializer
 import os
 
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
@@ -14,10 +15,12 @@ celery_app = Celery(
     include=['app.tasks']
 )
 
+register_celery_serializer()
+
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer=CELERY_SERIALIZER,
+    accept_content=CELERY_ACCEPT_CONTENT,
+    result_serializer=CELERY_SERIALIZER,
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -2,6 +2,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.core.serialization import dumps_str, loads
+
 import os
 
 SQLALCHEMY_DATABASE_URL = os.getenv(
@@ -14,7 +16,9 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
+    SQLALCHEMY_DATABASE_URL, connect_args=connect_args,
+    # JSON columns (history result_json, bulk job results) hold verification results
+    json_serializer=dumps_str, json_deserializer=loads
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,70 @@
+"""
+Fast JSON serialisation for verification results
+Used for API responses, Celery payloads and the JSON columns of the history tables.
+orjson when it is installed (several times faster than the stdlib, and emits enums and
+datetimes natively); otherwise the stdlib json module with the same behaviour for
+mappings such as VerificationResult.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Wire format for Celery messages. Workers accept orjson whenever it is installed, but
+# producers keep sending json until CELERY_SERIALIZER=orjson is set - only after every
+# worker runs a release that accepts it, so older workers never get messages they refuse.
+CELERY_SERIALIZER = os.getenv('CELERY_SERIALIZER', 'json') if orjson is not None else 'json'
+CELERY_ACCEPT_CONTENT = ['json', 'orjson'] if orjson is not None else ['json']
+CELERY_CONTENT_TYPE = 'application/x-orjson'
+
+
+def _default(obj: Any) -> Any:
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """JSON-encode to UTF-8 bytes"""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data) -> Any:
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        """JSON-encode to UTF-8 bytes"""
+        return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(data) -> Any:
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """JSON-encode to str (SQLAlchemy JSON columns)"""
+    return dumps(obj).decode('utf-8')
+
+
+def register_celery_serializer():
+    """Make the 'orjson' serializer available to Celery / kombu"""
+    if orjson is None:
+        return
+    from kombu.serialization import register
+    register(
+        'orjson', dumps, loads,
+        content_type=CELERY_CONTENT_TYPE,
+        content_encoding='binary',
+    )
@@ -62,6 +62,25 @@ app.include_router(admin.router, prefix="/v1/admin", tags=["admin"])
 app.include_router(crm.router, prefix="/v1/crm", tags=["crm"])
 app.include_router(ms_checker.router, prefix="/v1/ms-check", tags=["ms-check"])
 
+def _log_egress_check_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("smtp_egress_detection_failed", error=str(task.exception()))
+
+@app.on_event("startup")
+async def detect_smtp_egress():
+    """Probe port-25 egress in the background so SMTP phases know whether to run"""
+    import asyncio
+    from app.services.smtp_egress import smtp_egress
+    # Keep a reference: the loop only holds tasks weakly
+    app.state.egress_check = asyncio.create_task(smtp_egress.check())
+    app.state.egress_check.add_done_callback(_log_egress_check_failure)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close pooled keep-alive connections used by the specialized checkers"""
+    from app.services.http_client import http_client
+    await http_client.aclose()
+
 @app.get("/v1/credits")
 async def get_user_credits(
     db: Session = Depends(get_db),
@@ -126,6 +145,21 @@ async def detailed_health_check(db: Session = Depends(get_db)):
         health["components"]["redis"] = {"status": "unhealthy", "error": str(e)}
         health["status"] = "degraded"
     
+    # Check outbound SMTP (port 25)
+    from app.services.smtp_egress import smtp_egress
+    egress = smtp_egress.status()
+    health["components"]["smtp_egress"] = {
+        "status": "healthy" if egress["available"] is not False else "blocked",
+        **egress
+    }
+
+    # Provider-specific checkers: observed latency / verdict rate drive their ordering
+    from app.services.checker_registry import checker_registry
+    health["components"]["checkers"] = {
+        "status": "healthy",
+        "checkers": checker_registry.stats()
+    }
+
     return health
 
 if __name__ == "__main__":
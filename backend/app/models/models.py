@@ -140,3 +140,23 @@ class VerificationHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     user = relationship("User", back_populates="verification_history")
+
+
+class DisposableDomain(Base):
+    __tablename__ = "disposable_domains"
+
+    id = Column(Integer, primary_key=True, index=True)
+    domain = Column(String, unique=True, index=True, nullable=False)  # also matches its subdomains
+    added_at = Column(DateTime, default=datetime.utcnow)
+    source = Column(String)  # manual, api, community
+
+
+class SpamTrap(Base):
+    __tablename__ = "spam_traps"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email_hash = Column(String, unique=True, index=True, nullable=False)  # sha256 of the canonical address
+    domain = Column(String, index=True)
+    risk_level = Column(String)  # high, medium, low
+    added_at = Column(DateTime, default=datetime.utcnow)
+    source = Column(String)
@@ -1,8 +1,9 @@
-import requests
 import hashlib
 import logging
 from typing import Dict, Optional
 
+from app.services.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class AvatarChecker:
@@ -16,7 +17,7 @@ class AvatarChecker:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-    def check_gravatar(self, email: str) -> Dict:
+    async def check_gravatar(self, email: str, timeout: float = 5) -> Dict:
         """
         Check if email has a Gravatar profile.
         Returns: {'found': bool, 'url': str, 'platform': 'gravatar'}
@@ -26,7 +27,7 @@ class AvatarChecker:
             email_hash = hashlib.md5(email.lower().strip().encode('utf-8')).hexdigest()
             url = f"https://www.gravatar.com/avatar/{email_hash}?d=404"
             
-            response = requests.head(url, headers=self.headers, timeout=5)
+            response = await http_client.head(url, headers=self.headers, timeout=timeout)
             
             if response.status_code == 200:
                 return {
@@ -51,12 +52,12 @@ class AvatarChecker:
         # Simple Google Calendar already does a good job for existence.
         return {'found': False}
 
-    async def check_social_presence(self, email: str) -> Dict:
+    async def check_social_presence(self, email: str, timeout: float = 5) -> Dict:
         """
         Aggregate check for social presence.
         """
         # 1. Check Gravatar (Fastest, most public)
-        gravatar = self.check_gravatar(email)
+        gravatar = await self.check_gravatar(email, timeout)
         if gravatar['found']:
             return {
                 'has_social': True,
@@ -0,0 +1,232 @@
+"""
+Phase-Major Batch Executor
+Runs the verification pipeline one phase at a time across a whole list instead of one
+address at a time, dropping decided rows between phases:
+
+1. local checks (syntax, disposable, role) for every row - CPU only, one pass
+2. domain facts (domain, MX, SPF) once per unique domain
+3. provider-specific checks, bucketed by the provider that will answer them
+4. SMTP, grouped by MX host (one session per chunk, shared across domains on that host)
+
+Results are yielded as soon as the phase that decides them finishes.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from app.services.checker_registry import checker_registry
+from app.services.deadline import Deadline, DeadlineExceeded, VERIFY_DEADLINE_SECONDS
+from app.services.result_cache import result_cache
+from app.services.syntax_validator import syntax_validator
+
+logger = logging.getLogger(__name__)
+
+BATCH_DNS_CONCURRENCY = int(os.getenv('BATCH_DNS_CONCURRENCY', '50'))
+BATCH_PROVIDER_CONCURRENCY = int(os.getenv('BATCH_PROVIDER_CONCURRENCY', '50'))
+BATCH_SMTP_CONCURRENCY = int(os.getenv('BATCH_SMTP_CONCURRENCY', '20'))
+BATCH_MX_CHUNK = 200  # rows probed per SMTP session
+DNS_TIMEOUT = 10
+
+
+class BatchExecutor:
+    """Phase-major execution of large verification lists"""
+
+    def __init__(self, verifier=None):
+        self.verifier = verifier
+
+    def _verifier(self):
+        if self.verifier is None:
+            from app.services.email_verifier import email_verifier
+            self.verifier = email_verifier
+        return self.verifier
+
+    async def run(self, emails: Iterable[str], options: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Verify a list phase by phase, yielding each result once its phase decides it.
+        Accepts the same options as verify_many (depth, deadline); input is canonicalised
+        and results fanned out to every input spelling the same way.
+        """
+        from app.services.email_verifier import DEFAULT_DEPTH, VERIFICATION_DEPTHS
+
+        options = options or {}
+        depth = options.get('depth', DEFAULT_DEPTH)
+        if depth not in VERIFICATION_DEPTHS:
+            raise ValueError(f"Unknown verification depth: {depth}")
+        budget = float(options.get('deadline', VERIFY_DEADLINE_SECONDS))
+
+        verifier = self._verifier()
+        groups, variants = verifier._group_by_domain(emails)
+        total = sum(len(v) for v in variants.values())
+        if not total:
+            return
+        await verifier._load_local_indexes()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        emitted = set()
+
+        def done(result: Dict):
+            if result['email'] not in emitted:
+                emitted.add(result['email'])
+                result_cache.put(result)
+                verifier._fan_out(result, variants, queue.put_nowait)
+
+        async def produce():
+            rows = [verifier._new_result(email, depth) for group in groups.values() for email in group]
+            try:
+                rows = self._local_phase(rows, depth, done)
+                if rows:
+                    rows = await self._domain_phase(rows, depth, done)
+                if rows:
+                    rows = await self._provider_phase(rows, budget, done)
+                if rows:
+                    await self._smtp_phase(rows, depth, budget, done)
+            except Exception as e:
+                logger.error(f"Batch executor failed: {e}")
+                for row in rows:
+                    if row['email'] not in emitted:
+                        row['details']['error'] = str(e)
+                        row['final_status'] = 'error'
+                        done(row)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            for _ in range(total):
+                yield await queue.get()
+        finally:
+            producer.cancel()
+
+    def _local_phase(self, rows: List[Dict], depth: str, done) -> List[Dict]:
+        """Phase 1: pure CPU, no awaits"""
+        verifier = self._verifier()
+        pending = []
+        verdicts = syntax_validator.validate_many([row['email'] for row in rows])
+        for row, syntax in zip(rows, verdicts):
+            if verifier._apply_local_checks(row, row['email'], syntax):
+                done(row)
+            elif depth == 'syntax':
+                verifier._finish_shallow(row)
+                done(row)
+            else:
+                pending.append(row)
+        return pending
+
+    async def _domain_phase(self, rows: List[Dict], depth: str, done) -> List[Dict]:
+        """Phase 2: resolve each unique domain once, then apply the facts to every row"""
+        verifier = self._verifier()
+        by_domain = defaultdict(list)
+        for row in rows:
+            by_domain[row['email'].rsplit('@', 1)[1]].append(row)
+
+        semaphore = asyncio.Semaphore(BATCH_DNS_CONCURRENCY)
+
+        async def resolve(domain: str) -> bool:
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.to_thread(verifier._prefetch_domain, domain, depth != 'dns'), DNS_TIMEOUT
+                    )
+                    return True
+                except asyncio.TimeoutError:
+                    return False
+
+        resolved = await asyncio.gather(*(resolve(d) for d in by_domain))
+
+        pending = []
+        for (domain, domain_rows), ok in zip(by_domain.items(), resolved):
+            for row in domain_rows:
+                if not ok:
+                    row['partial'] = True
+                    row['details']['deadline_exceeded'] = 'dns'
+                    verifier._finish_shallow(row, 'Domain lookup timed out')
+                    done(row)
+                elif verifier._apply_domain_checks(row, domain):
+                    done(row)
+                elif depth == 'dns':
+                    verifier._finish_shallow(row)
+                    done(row)
+                else:
+                    pending.append(row)
+        return pending
+
+    async def _provider_phase(self, rows: List[Dict], budget: float, done) -> List[Dict]:
+        """Phase 3: provider-specific checks, one bucket per answering provider"""
+        verifier = self._verifier()
+        buckets = defaultdict(list)
+        contexts = {}
+        for row in rows:
+            domain = row['email'].rsplit('@', 1)[1]
+            ctx = {
+                'email': row['email'],
+                'domain': domain,
+                'mx_records': row['mx_records'],
+                'spf_is_o365': verifier._spf_is_o365_cached(domain)  # prefetched in phase 2
+            }
+            contexts[row['email']] = ctx
+            checks = checker_registry.ordered(ctx)
+            buckets[checks[0].name if checks else None].append(row)
+
+        pending = list(buckets.pop(None, []))
+        semaphore = asyncio.Semaphore(BATCH_PROVIDER_CONCURRENCY)
+
+        async def check(row: Dict):
+            async with semaphore:
+                try:
+                    result = await Deadline(budget).run(checker_registry.run(contexts[row['email']]))
+                except asyncio.TimeoutError:
+                    result = None
+                    row['details']['provider_check_skipped'] = 'deadline'
+            if verifier._apply_specialized_result(row, result):
+                done(row)
+            else:
+                pending.append(row)
+
+        # Buckets run one provider after another so each provider's connections stay warm
+        for provider, bucket in buckets.items():
+            await asyncio.gather(*(check(row) for row in bucket))
+        return pending
+
+    async def _smtp_phase(self, rows: List[Dict], depth: str, budget: float, done):
+        """Phase 4: SMTP grouped by MX host, chunked so one session never carries too many rows"""
+        verifier = self._verifier()
+        by_mx = defaultdict(list)
+        for row in rows:
+            by_mx[row['mx_records'][0] if row['mx_records'] else None].append(row)
+
+        semaphore = asyncio.Semaphore(BATCH_SMTP_CONCURRENCY)
+
+        async def probe_chunk(mx_host: Optional[str], chunk: List[Dict]):
+            finished = set()
+
+            def chunk_done(row: Dict):
+                finished.add(row['email'])
+                done(row)
+
+            async with semaphore:
+                deadline = Deadline(budget)
+                try:
+                    await verifier._smtp_phase(chunk, mx_host, depth, deadline, chunk_done)
+                except DeadlineExceeded:
+                    for row in chunk:
+                        if row['email'] not in finished:
+                            verifier._finish_partial(row, 'smtp', deadline)
+                            done(row)
+                except Exception as e:
+                    logger.error(f"Batch SMTP chunk for {mx_host} failed: {e}")
+                    for row in chunk:
+                        if row['email'] not in finished:
+                            row['details']['error'] = str(e)
+                            row['final_status'] = 'error'
+                            done(row)
+
+        await asyncio.gather(*(
+            probe_chunk(mx_host, mx_rows[i:i + BATCH_MX_CHUNK])
+            for mx_host, mx_rows in by_mx.items()
+            for i in range(0, len(mx_rows), BATCH_MX_CHUNK)
+        ))
+
+
+# Singleton instance
+batch_executor = BatchExecutor()
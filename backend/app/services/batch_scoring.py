@@ -0,0 +1,192 @@
+"""
+Batch Scoring
+Columnar version of the final scoring step (EmailVerificationService._calculate_final_status
+and _assess_spam_risk) for many results at once. The flags of a batch (disposable, syntax,
+domain, MX, SMTP outcome, catch-all, role) are packed into NumPy arrays and the rule table
+is applied as vectorised masks with first-match semantics, producing status, score, reason
+and spam-risk arrays. Results are identical to the single-address functions
+(tests/test_batch_scoring.py checks every flag combination).
+
+NumPy is optional: without it the single-address functions are applied row by row.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from app.services.verification_result import FinalStatus
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# SMTP outcome -> column code
+SMTP_OTHER, SMTP_MAILBOX_FULL, SMTP_DISABLED, SMTP_USER_NOT_FOUND, SMTP_INVALID_MAILBOX, \
+    SMTP_REJECTED, SMTP_TEMPORARY, SMTP_SOFT = range(8)
+SMTP_CODES = {
+    'mailbox_full': SMTP_MAILBOX_FULL,
+    'account_disabled': SMTP_DISABLED,
+    'user_not_found': SMTP_USER_NOT_FOUND,
+    'invalid_mailbox': SMTP_INVALID_MAILBOX,
+    'rejected': SMTP_REJECTED,
+    'temporary_failure': SMTP_TEMPORARY,
+    'greylisted': SMTP_TEMPORARY,
+    'rate_limited': SMTP_TEMPORARY,
+    'unreachable': SMTP_SOFT,
+    'policy_blocked': SMTP_SOFT,
+}
+
+REASONS = [
+    'Disposable email address',
+    'Invalid email syntax',
+    'Domain does not exist',
+    'No MX records found',
+    'Mailbox is full - cannot receive emails',
+    'Account disabled or suspended',
+    'User does not exist',
+    'Invalid mailbox name',
+    'Email rejected by server',
+    'Temporary server issue - try again later',
+    'ACCEPT ALL',
+    'Valid and safe to send',
+    'Valid but risky',
+    'Catch-all domain - cannot verify specific mailbox',
+    'Role-based email address',
+    'Risky email address',
+    'Invalid or unverifiable',
+]
+_REASON = {reason: i for i, reason in enumerate(REASONS)}
+
+STATUSES = list(FinalStatus)
+SPAM_RISKS = ('high', 'low', 'medium')
+_STATUS = {status.value: i for i, status in enumerate(STATUSES)}
+
+# Terminal rules in order: (column, SMTP code or None, status, score, reason).
+# A rule on a flag column fires when the flag is set (or, for syntax/domain/mx, missing).
+RULES = [
+    ('disposable', None, 'disposable', 30, 'Disposable email address'),
+    ('syntax_bad', None, 'invalid_syntax', 0, 'Invalid email syntax'),
+    ('domain_bad', None, 'invalid_domain', 10, 'Domain does not exist'),
+    ('mx_missing', None, 'no_mx', 15, 'No MX records found'),
+    ('smtp', SMTP_MAILBOX_FULL, 'mailbox_full', 40, 'Mailbox is full - cannot receive emails'),
+    ('smtp', SMTP_DISABLED, 'account_disabled', 25, 'Account disabled or suspended'),
+    ('smtp', SMTP_USER_NOT_FOUND, 'invalid', 20, 'User does not exist'),
+    ('smtp', SMTP_INVALID_MAILBOX, 'invalid', 15, 'Invalid mailbox name'),
+    ('smtp', SMTP_REJECTED, 'invalid', 20, 'Email rejected by server'),
+    ('smtp', SMTP_TEMPORARY, 'temporary_failure', 60, 'Temporary server issue - try again later'),
+    ('soft_catch_all', None, 'risky', 50, 'ACCEPT ALL'),
+]
+
+
+class BatchScorer:
+    """Final status, safety score, reason and spam risk for many results at once"""
+
+    def __init__(self, verifier=None):
+        self.verifier = verifier
+
+    def _verifier(self):
+        if self.verifier is None:
+            from app.services.email_verifier import email_verifier
+            self.verifier = email_verifier
+        return self.verifier
+
+    def _columns(self, results: Sequence[Dict]) -> Dict:
+        n = len(results)
+
+        def flags(values: Iterable[bool]):
+            return np.fromiter(values, dtype=bool, count=n)
+
+        smtp = np.fromiter((SMTP_CODES.get(r['smtp'], SMTP_OTHER) for r in results), dtype=np.int8, count=n)
+        catch_all = flags(bool(r['catch_all']) for r in results)
+        return {
+            'disposable': flags(bool(r['disposable']) for r in results),
+            'syntax_bad': flags(r['syntax'] != 'valid' for r in results),
+            'domain_bad': flags(r['domain'] != 'valid' for r in results),
+            'mx_missing': flags(r['mx'] != 'found' for r in results),
+            'smtp': smtp,
+            'catch_all': catch_all,
+            'role': flags(bool(r['role_based']) for r in results),
+            'spam_trap': flags(bool(r.get('spam_trap')) for r in results),
+            'soft_catch_all': (smtp == SMTP_SOFT) & catch_all,
+        }
+
+    def score(self, results: Sequence[Dict]) -> List[Tuple[str, int, str]]:
+        """(final_status, safety_score, reason) per result, as _calculate_final_status"""
+        if not results:
+            return []
+        if np is None:
+            verifier = self._verifier()
+            return [verifier._calculate_final_status(r) for r in results]
+
+        statuses, scores, reasons = self._score_arrays(self._columns(results))
+        return [
+            (STATUSES[s].value, score, REASONS[reason])
+            for s, score, reason in zip(statuses.tolist(), scores.tolist(), reasons.tolist())
+        ]
+
+    def _score_arrays(self, cols: Dict):
+        """Status-code, score and reason-code arrays from the flag columns"""
+        # Rows no terminal rule catches: deductions, then score thresholds
+        score = 100 - 30 * (cols['smtp'] == SMTP_SOFT) - 20 * cols['catch_all'] - 10 * cols['role']
+        risky_reason = np.where(
+            cols['role'], _REASON['Role-based email address'],
+            np.where(cols['catch_all'], _REASON['Catch-all domain - cannot verify specific mailbox'],
+                     _REASON['Valid but risky'])
+        )
+        bands = [score >= 90, score >= 70, score >= 50]
+        status = np.select(bands, [_STATUS['valid_safe'], _STATUS['valid_risky'], _STATUS['risky']],
+                           _STATUS['invalid'])
+        reason = np.select(bands, [_REASON['Valid and safe to send'], risky_reason,
+                                   _REASON['Risky email address']], _REASON['Invalid or unverifiable'])
+
+        masks = [cols[column] if code is None else cols[column] == code for column, code, *_ in RULES]
+        status = np.select(masks, [_STATUS[rule[2]] for rule in RULES], status)
+        score = np.select(masks, [rule[3] for rule in RULES], score)
+        reason = np.select(masks, [_REASON[rule[4]] for rule in RULES], reason)
+        return status, score, reason
+
+    def apply(self, results: Sequence[Dict]):
+        """Phase 5 for a batch: set final_status, safety_score, reason and spam_risk in place"""
+        if not results:
+            return
+        if np is None:
+            verifier = self._verifier()
+            for result in results:
+                result['final_status'], result['safety_score'], result['reason'] = \
+                    verifier._calculate_final_status(result)
+                result['spam_risk'] = verifier._assess_spam_risk(result)
+            return
+
+        cols = self._columns(results)
+        statuses, scores, reasons = self._score_arrays(cols)
+        risks = np.select(
+            [cols['disposable'] | cols['spam_trap'], scores >= 80, scores >= 60], [0, 1, 2], 0
+        )
+        for result, s, score, reason, risk in zip(
+            results, statuses.tolist(), scores.tolist(), reasons.tolist(), risks.tolist()
+        ):
+            result['final_status'] = STATUSES[s]
+            result['safety_score'] = score
+            result['reason'] = REASONS[reason]
+            result['spam_risk'] = SPAM_RISKS[risk]
+
+    def status_counts(self, results: Sequence[Dict]) -> Dict[str, int]:
+        """Number of results per final_status"""
+        if np is None:
+            return dict(Counter(str(r.get('final_status')) for r in results))
+        other = len(STATUSES)
+        codes = np.fromiter(
+            (_STATUS.get(r.get('final_status'), other) for r in results), dtype=np.int16, count=len(results)
+        )
+        counts = np.bincount(codes, minlength=other + 1)
+        summary = {STATUSES[i].value: int(c) for i, c in enumerate(counts[:other].tolist()) if c}
+        if counts[other]:
+            # Statuses outside FinalStatus (or missing) are rare: count them directly
+            summary.update(Counter(
+                str(r.get('final_status')) for r in results if r.get('final_status') not in _STATUS
+            ))
+        return summary
+
+
+# Singleton instance
+batch_scorer = BatchScorer()
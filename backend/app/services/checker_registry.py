@@ -0,0 +1,224 @@
+"""
+Mailbox Checker Registry
+Provider-specific checks (Office 365, Gmail calendar, known catch-all registry, ...) declare
+which addresses they apply to and what they cost. The registry runs the applicable ones
+cheapest-per-answer first and stops at the first definitive verdict; the SMTP phase only
+runs when none of them settles the address.
+
+Adding a checker: subclass MailboxCheck and call checker_registry.register(...).
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.services.catch_all_db import is_known_catch_all
+from app.services.gmail_checker import gmail_checker
+from app.services.office365_checker import office365_checker
+from app.services.provider_index import provider_index
+
+logger = logging.getLogger(__name__)
+
+STATS_PRIOR_CALLS = 10    # weight of the declared accuracy until real observations accumulate
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_WINDOW = 200      # recent latencies kept for the p90
+P90_MIN_SAMPLES = 20      # below this, p90 is estimated as twice the average latency
+
+
+class MailboxCheck:
+    """
+    One provider-specific check.
+
+    Subclasses set `name`, `cost` (expected latency in ms) and `accuracy` (prior share of
+    calls that end in a definitive verdict), and implement `applies` and `check`.
+    `check` returns the specialized result dict ({'valid', 'method', 'details', 'catch_all'})
+    or None; `valid` True/False is definitive, None is not.
+    """
+
+    name = 'base'
+    cost = 1000.0
+    accuracy = 0.5
+
+    def applies(self, ctx: Dict) -> bool:
+        raise NotImplementedError
+
+    async def check(self, ctx: Dict) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class Office365Check(MailboxCheck):
+    name = 'office365'
+    cost = 800.0   # autodiscover (domain, cached) + Microsoft login API
+    accuracy = 0.9
+
+    def applies(self, ctx: Dict) -> bool:
+        return provider_index.classify(ctx['domain'], ctx['mx_records']) == 'microsoft' or ctx['spf_is_o365']
+
+    async def check(self, ctx: Dict) -> Optional[Dict]:
+        return await office365_checker.check_email(ctx['email'])
+
+
+class GmailCalendarCheck(MailboxCheck):
+    name = 'gmail_calendar'
+    cost = 400.0   # two HEAD requests (address + random address for catch-all)
+    accuracy = 0.9
+
+    def applies(self, ctx: Dict) -> bool:
+        return provider_index.classify(ctx['domain'], ctx['mx_records']) == 'google'
+
+    async def check(self, ctx: Dict) -> Optional[Dict]:
+        return await gmail_checker.check_email(ctx['email'])
+
+
+class CatchAllRegistryCheck(MailboxCheck):
+    """Marks addresses on known catch-all domains; never definitive, but free"""
+    name = 'catch_all_registry'
+    cost = 0.01
+    accuracy = 0.0
+
+    def applies(self, ctx: Dict) -> bool:
+        return is_known_catch_all(ctx['domain'])
+
+    async def check(self, ctx: Dict) -> Optional[Dict]:
+        return {
+            'valid': None,
+            'catch_all': True,
+            'method': 'catch_all_registry',
+            'details': 'Domain is in the known catch-all registry'
+        }
+
+
+class CheckerStats:
+    """Observed latency and definitive-answer rate of one checker"""
+
+    def __init__(self, prior_cost: float, prior_accuracy: float):
+        self.calls = 0
+        self.definitive = 0
+        self.errors = 0
+        self.latency_ms = prior_cost
+        self.prior_accuracy = prior_accuracy
+        self._recent = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, elapsed_ms: float, definitive: bool, error: bool = False):
+        self.calls += 1
+        self.definitive += int(definitive)
+        self.errors += int(error)
+        self.latency_ms += LATENCY_EWMA_ALPHA * (elapsed_ms - self.latency_ms)
+        self._recent.append(elapsed_ms)
+
+    def record_abandoned(self, elapsed_ms: float):
+        """A call cancelled after elapsed_ms: its latency was at least that much"""
+        self._recent.append(elapsed_ms)
+
+    @property
+    def p90_ms(self) -> float:
+        if len(self._recent) < P90_MIN_SAMPLES:
+            return 2 * self.latency_ms
+        recent = sorted(self._recent)
+        return recent[int(0.9 * (len(recent) - 1))]
+
+    @property
+    def accuracy(self) -> float:
+        """Share of calls ending in a verdict, smoothed towards the declared prior"""
+        return (self.definitive + self.prior_accuracy * STATS_PRIOR_CALLS) / (self.calls + STATS_PRIOR_CALLS)
+
+    @property
+    def expected_cost(self) -> float:
+        """Expected latency per definitive answer (lower runs first)"""
+        return self.latency_ms / max(self.accuracy, 0.01)
+
+
+class CheckerRegistry:
+    """Registered checks, ordered by observed cost per definitive answer"""
+
+    def __init__(self):
+        self._checks: Dict[str, MailboxCheck] = {}
+        self._stats: Dict[str, CheckerStats] = {}
+
+    def register(self, check: MailboxCheck):
+        self._checks[check.name] = check
+        self._stats[check.name] = CheckerStats(check.cost, check.accuracy)
+
+    def unregister(self, name: str):
+        self._checks.pop(name, None)
+        self._stats.pop(name, None)
+
+    def ordered(self, ctx: Dict) -> List[MailboxCheck]:
+        """Checks that apply to this address, cheapest expected answer first"""
+        applicable = []
+        for check in self._checks.values():
+            try:
+                if check.applies(ctx):
+                    applicable.append(check)
+            except Exception as e:
+                logger.warning(f"Checker {check.name} applies() failed: {e}")
+        return sorted(applicable, key=lambda c: self._stats[c.name].expected_cost)
+
+    def hedge_delay(self, ctx: Dict) -> Optional[float]:
+        """
+        Seconds after which a run for this address is slower than usual: the p90 of the
+        checks up to the first one that can give a definitive answer. None when none can.
+        """
+        delay_ms = 0.0
+        for check in self.ordered(ctx):
+            delay_ms += self._stats[check.name].p90_ms
+            if check.accuracy > 0:
+                return delay_ms / 1000
+        return None
+
+    async def run(self, ctx: Dict) -> Optional[Dict]:
+        """
+        Run applicable checks until one is definitive.
+        Returns that result, else the last non-definitive one (catch-all flags merged), else None.
+        """
+        fallback = None
+        catch_all = False
+        for check in self.ordered(ctx):
+            started = time.monotonic()
+            try:
+                result = await check.check(ctx)
+            except asyncio.CancelledError:
+                # Lost a race (or the deadline): still a latency observation
+                self._stats[check.name].record_abandoned((time.monotonic() - started) * 1000)
+                raise
+            except Exception as e:
+                self._stats[check.name].record((time.monotonic() - started) * 1000, False, error=True)
+                logger.warning(f"Checker {check.name} failed for {ctx['email']}: {e}")
+                continue
+            definitive = bool(result) and result.get('valid') is not None
+            self._stats[check.name].record((time.monotonic() - started) * 1000, definitive)
+            if not result:
+                continue
+            catch_all = catch_all or bool(result.get('catch_all'))
+            if definitive:
+                if catch_all:
+                    result = {**result, 'catch_all': True}
+                return result
+            fallback = result
+        if fallback is not None and catch_all:
+            fallback = {**fallback, 'catch_all': True}
+        return fallback
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-checker observations, for health checks"""
+        return {
+            name: {
+                'calls': s.calls,
+                'definitive': s.definitive,
+                'errors': s.errors,
+                'latency_ms': round(s.latency_ms, 1),
+                'p90_ms': round(s.p90_ms, 1),
+                'accuracy': round(s.accuracy, 3),
+                'expected_cost_ms': round(s.expected_cost, 1)
+            }
+            for name, s in self._stats.items()
+        }
+
+
+# Singleton instance
+checker_registry = CheckerRegistry()
+checker_registry.register(CatchAllRegistryCheck())
+checker_registry.register(Office365Check())
+checker_registry.register(GmailCalendarCheck())
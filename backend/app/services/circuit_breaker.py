@@ -0,0 +1,144 @@
+"""
+Circuit Breaker Service
+Tracks SMTP connect failures per MX host / IP so dead or filtering hosts fail fast
+instead of burning the full connect timeout for every address
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = int(os.getenv('SMTP_BREAKER_FAILURE_THRESHOLD', '3'))
+RECOVERY_TIMEOUT = float(os.getenv('SMTP_BREAKER_RECOVERY_SECONDS', '60'))
+MAX_RECOVERY_TIMEOUT = float(os.getenv('SMTP_BREAKER_MAX_RECOVERY_SECONDS', '900'))
+
+
+class CircuitBreaker:
+    """
+    Per-key circuit breaker (closed -> open -> half_open -> closed).
+
+    - closed: calls pass through; consecutive failures are counted
+    - open: calls fail fast until the recovery timeout elapses
+    - half_open: a limited number of trial calls test whether the key recovered;
+      a success closes the circuit, a failure re-opens it with a longer timeout
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        max_recovery_timeout: float = MAX_RECOVERY_TIMEOUT,
+        half_open_max_trials: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self.half_open_max_trials = half_open_max_trials
+        self._circuits: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, key: str) -> dict:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = {
+                'state': self.CLOSED,
+                'failures': 0,
+                'opened_at': 0.0,
+                'timeout': self.recovery_timeout,
+                'trials': 0
+            }
+            self._circuits[key] = circuit
+        return circuit
+
+    def _refresh(self, circuit: dict):
+        """Move an open circuit to half_open once its recovery timeout has elapsed"""
+        if circuit['state'] == self.OPEN and time.time() - circuit['opened_at'] >= circuit['timeout']:
+            circuit['state'] = self.HALF_OPEN
+            circuit['trials'] = 0
+
+    def allow(self, *keys: Optional[str]) -> bool:
+        """
+        Return True if a call may proceed for all given keys (e.g. MX host and IP).
+        Consumes a half-open trial slot for keys that are half open.
+        """
+        keys = [k for k in keys if k]
+        with self._lock:
+            circuits = [self._circuit(k) for k in keys]
+            for circuit in circuits:
+                self._refresh(circuit)
+                if circuit['state'] == self.OPEN:
+                    return False
+                if circuit['state'] == self.HALF_OPEN and circuit['trials'] >= self.half_open_max_trials:
+                    return False
+            for circuit in circuits:
+                if circuit['state'] == self.HALF_OPEN:
+                    circuit['trials'] += 1
+            return True
+
+    def record_success(self, *keys: Optional[str]):
+        """Close the circuit for every key after a successful call"""
+        with self._lock:
+            for key in keys:
+                if not key:
+                    continue
+                circuit = self._circuit(key)
+                if circuit['state'] != self.CLOSED:
+                    logger.info(f"Circuit closed for {key}")
+                circuit.update(state=self.CLOSED, failures=0, trials=0, timeout=self.recovery_timeout)
+
+    def release(self, *keys: Optional[str]):
+        """Give back a half-open trial slot for a call that ended without a verdict (cancelled, out of budget)"""
+        with self._lock:
+            for key in keys:
+                if not key:
+                    continue
+                circuit = self._circuit(key)
+                if circuit['state'] == self.HALF_OPEN and circuit['trials'] > 0:
+                    circuit['trials'] -= 1
+
+    def record_failure(self, *keys: Optional[str]):
+        """Count a failure; open the circuit once the threshold is reached"""
+        with self._lock:
+            now = time.time()
+            for key in keys:
+                if not key:
+                    continue
+                circuit = self._circuit(key)
+                if circuit['state'] == self.HALF_OPEN:
+                    # Trial failed: re-open with a longer recovery timeout
+                    circuit['timeout'] = min(circuit['timeout'] * 2, self.max_recovery_timeout)
+                    circuit.update(state=self.OPEN, opened_at=now, trials=0)
+                    logger.warning(f"Circuit re-opened for {key} ({circuit['timeout']:.0f}s)")
+                    continue
+                circuit['failures'] += 1
+                if circuit['state'] == self.CLOSED and circuit['failures'] >= self.failure_threshold:
+                    circuit.update(state=self.OPEN, opened_at=now)
+                    logger.warning(f"Circuit opened for {key} after {circuit['failures']} failures")
+
+    def state(self, key: str) -> str:
+        """Current state for a key"""
+        with self._lock:
+            circuit = self._circuit(key)
+            self._refresh(circuit)
+            return circuit['state']
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Non-closed circuits, for monitoring"""
+        with self._lock:
+            return {
+                key: {'state': c['state'], 'failures': c['failures'], 'timeout': c['timeout']}
+                for key, c in self._circuits.items()
+                if c['state'] != self.CLOSED
+            }
+
+
+# Singleton instance shared by all SMTP probes
+smtp_circuit_breaker = CircuitBreaker()
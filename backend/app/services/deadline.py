@@ -0,0 +1,59 @@
+"""
+Verification Deadline
+One time budget for a whole verification, shared by every phase.
+Each step asks the deadline how long it may take instead of using its own fixed timeout,
+so the total stays under the budget and the caller gets a partial verdict when it runs out.
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Default budget for one verification (single-verify API p99 ceiling)
+VERIFY_DEADLINE_SECONDS = float(os.getenv('VERIFY_DEADLINE_SECONDS', '15'))
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The verification budget ran out"""
+
+
+class Deadline:
+    """A fixed point in time (monotonic clock) that phases count down to"""
+
+    def __init__(self, seconds: float = VERIFY_DEADLINE_SECONDS):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return self.budget - (self.expires_at - time.monotonic())
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Time a step may use: what remains, never more than its own cap"""
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+    async def run(self, awaitable: Awaitable[T], cap: Optional[float] = None) -> T:
+        """
+        Await within the remaining budget.
+        Raises DeadlineExceeded when the budget runs out, plain TimeoutError when only `cap` does.
+        """
+        timeout = self.timeout(cap)
+        if timeout <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            if self.expired():
+                raise DeadlineExceeded()
+            raise
@@ -0,0 +1,182 @@
+"""
+Disposable Domain Index
+Hashed-suffix set of disposable email domains, merged from data/disposable_domains.txt
+and the disposable_domains table. A domain matches when it or any parent domain is listed
+(x.mailinator.com matches mailinator.com), so a lookup is one set probe per label.
+
+Sources are re-checked at most every DISPOSABLE_RELOAD_INTERVAL seconds (file mtime, table
+row count / max id) in a background thread; when either changed the set is rebuilt off to
+the side and swapped in with a single assignment, so running workers pick up new entries
+without a restart. Lookups only read the in-memory snapshot: async callers load it once
+with `await ensure_loaded()` so the event loop never waits on the file or the database.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DISPOSABLE_DOMAINS_FILE = os.getenv(
+    'DISPOSABLE_DOMAINS_FILE',
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'disposable_domains.txt')
+)
+DISPOSABLE_RELOAD_INTERVAL = float(os.getenv('DISPOSABLE_RELOAD_INTERVAL', '60'))
+
+# Used only when the data file is missing
+FALLBACK_DISPOSABLE_DOMAINS = {
+    'tempmail.com', 'guerrillamail.com', '10minutemail.com', 'mailinator.com',
+    'throwaway.email', 'temp-mail.org', 'getnada.com', 'maildrop.cc',
+    'yopmail.com', 'fakeinbox.com', 'trashmail.com', 'sharklasers.com'
+}
+
+
+def _normalize(domain: str) -> str:
+    return domain.strip().rstrip('.').lower()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class DisposableDomainIndex:
+    """Disposable domains (file + DB) with parent-domain matching and hot reload"""
+
+    def __init__(self, file_path: str = DISPOSABLE_DOMAINS_FILE,
+                 reload_interval: float = DISPOSABLE_RELOAD_INTERVAL, use_db: bool = True):
+        self.file_path = file_path
+        self.reload_interval = reload_interval
+        self.use_db = use_db
+        self._domains: FrozenSet[str] = frozenset()
+        self._file_version: Optional[float] = None
+        self._db_version: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._background = threading.Lock()  # held while a background reload runs
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        return len(self._domains)
+
+    def _ensure_fresh(self):
+        # Without a running event loop the first use may load in place; otherwise loads and
+        # re-checks happen in a background thread and the current snapshot is served meanwhile
+        if not self._loaded and not _on_event_loop():
+            self.reload(force=True)
+        elif not self._loaded or time.monotonic() - self._checked_at >= self.reload_interval:
+            self._reload_in_background()
+
+    def _reload_in_background(self):
+        if not self._background.acquire(blocking=False):
+            return
+        self._checked_at = time.monotonic()
+        threading.Thread(target=self._background_reload, name='disposable-reload', daemon=True).start()
+
+    def _background_reload(self):
+        try:
+            self.reload(force=not self._loaded)
+        except Exception as e:
+            logger.warning(f"Disposable domains reload failed: {e}")
+        finally:
+            self._background.release()
+
+    async def ensure_loaded(self):
+        """Load the sources off the event loop before the first lookup"""
+        if not self._loaded:
+            await asyncio.to_thread(self.reload, True)
+
+    def contains(self, domain: str) -> bool:
+        """Whether the domain or any of its parent domains is disposable"""
+        self._ensure_fresh()
+        domains = self._domains  # one snapshot per lookup; reloads swap the reference
+        domain = _normalize(domain)
+        while True:
+            if domain in domains:
+                return True
+            _, dot, domain = domain.partition('.')
+            if not dot:
+                return False
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the set when a source changed (or always, when forced). Returns True if rebuilt."""
+        # A concurrent caller keeps using the current set rather than waiting
+        if not self._lock.acquire(blocking=force):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            file_version = self._file_signature()
+            db_version = self._db_signature()
+            if not force and file_version == self._file_version and db_version == self._db_version:
+                return False
+
+            domains = self._load_file() | self._load_db()
+            self._domains = frozenset(domains)
+            self._file_version, self._db_version = file_version, db_version
+            self._loaded = True
+            logger.info(f"Loaded {len(domains)} disposable email domains")
+            return True
+        finally:
+            self._lock.release()
+
+    # ── Sources ───────────────────────────────────────────────────────
+
+    def _file_signature(self) -> Optional[float]:
+        try:
+            return os.stat(self.file_path).st_mtime
+        except OSError:
+            return None
+
+    def _load_file(self) -> set:
+        try:
+            with open(self.file_path, 'r') as f:
+                return {_normalize(line) for line in f if line.strip() and not line.startswith('#')}
+        except FileNotFoundError:
+            logger.warning(f"Disposable domains file not found at {self.file_path}, using fallback list")
+            return set(FALLBACK_DISPOSABLE_DOMAINS)
+        except Exception as e:
+            logger.warning(f"Error loading disposable domains file: {e}")
+            return set()
+
+    def _db_signature(self) -> Optional[Tuple]:
+        """Row count and max id change on every insert / delete"""
+        if not self.use_db:
+            return None
+        try:
+            from sqlalchemy import func
+            from app.core.database import SessionLocal
+            from app.models.models import DisposableDomain
+            db = SessionLocal()
+            try:
+                return tuple(db.query(func.count(DisposableDomain.id), func.max(DisposableDomain.id)).one())
+            finally:
+                db.close()
+        except Exception as e:
+            logger.debug(f"Disposable domains table unavailable: {e}")
+            return None
+
+    def _load_db(self) -> set:
+        if not self.use_db:
+            return set()
+        try:
+            from app.core.database import SessionLocal
+            from app.models.models import DisposableDomain
+            db = SessionLocal()
+            try:
+                return {_normalize(domain) for (domain,) in db.query(DisposableDomain.domain) if domain}
+            finally:
+                db.close()
+        except Exception as e:
+            logger.debug(f"Disposable domains table unavailable: {e}")
+            return set()
+
+
+# Singleton instance
+disposable_index = DisposableDomainIndex()
@@ -0,0 +1,57 @@
+"""
+Domain Normalizer
+Bounded memo of raw domain -> (ASCII/punycode form, Unicode form, registrable domain), so
+an internationalised domain is IDNA-processed once per process instead of once per
+address and per DNS query. The pipeline works on the ASCII form throughout (syntax fast
+path, DNS, SMTP, provider classification); the Unicode form is for display.
+
+The registrable domain uses a compact public-suffix approximation: the last label, or the
+last two when the TLD is a ccTLD with a generic second level (co.uk, com.au, ne.jp).
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import idna
+
+# Generic second-level labels used under country-code TLDs
+CC_SECOND_LEVELS = {'co', 'com', 'net', 'org', 'ac', 'edu', 'gov', 'gob', 'go', 'ne', 'or', 'mil', 'nic'}
+
+
+class DomainForms(NamedTuple):
+    ascii: str
+    unicode: str
+    registrable: str
+
+
+def _registrable(ascii_domain: str) -> str:
+    labels = ascii_domain.split('.')
+    suffix_len = 2 if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in CC_SECOND_LEVELS else 1
+    return '.'.join(labels[-(suffix_len + 1):])
+
+
+@lru_cache(maxsize=65536)
+def domain_forms(domain: str) -> Optional[DomainForms]:
+    """
+    ASCII, Unicode and registrable forms of a domain (lower-cased, trailing dot removed),
+    or None when it is not valid IDNA.
+    """
+    domain = (domain or '').strip().rstrip('.')
+    if not domain or domain.startswith('.') or '..' in domain:
+        return None
+    if domain.isascii() and 'xn--' not in domain.lower():
+        ascii_domain = unicode_domain = domain.lower()
+    else:
+        try:
+            # UTS #46 mapping (case folding, full-width dots, ...) as email_validator does
+            ascii_domain = idna.encode(domain, uts46=True).decode('ascii').lower()
+            unicode_domain = idna.decode(ascii_domain)
+        except (idna.IDNAError, UnicodeError):
+            return None
+    return DomainForms(ascii_domain, unicode_domain, _registrable(ascii_domain))
+
+
+def to_ascii(domain: str) -> str:
+    """ASCII form of a domain, or the lower-cased input when it is not valid IDNA"""
+    forms = domain_forms(domain)
+    return forms.ascii if forms else (domain or '').strip().rstrip('.').lower()
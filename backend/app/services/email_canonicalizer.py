@@ -0,0 +1,80 @@
+"""
+Email Canonicalizer
+Maps address variants that reach the same mailbox onto one canonical address, so a job
+probes each mailbox once: Gmail ignores dots and "+tag" suffixes, several providers
+support "+tag" sub-addressing, domains are case-insensitive (IDN domains are mapped to
+punycode) and may carry a trailing root dot.
+"""
+
+from functools import lru_cache
+
+from app.services.domain_normalizer import domain_forms
+
+# Providers whose local part ignores dots entirely
+DOT_INSENSITIVE_DOMAINS = {'gmail.com', 'googlemail.com'}
+
+# Domains that are aliases of another mailbox domain
+DOMAIN_ALIASES = {'googlemail.com': 'gmail.com'}
+
+# Providers that deliver "user+tag@" to "user@"
+PLUS_ADDRESSING_DOMAINS = {
+    'gmail.com', 'googlemail.com',
+    'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'icloud.com', 'me.com', 'mac.com',
+    'fastmail.com', 'fastmail.fm',
+    'protonmail.com', 'protonmail.ch', 'proton.me', 'pm.me',
+    'yandex.com', 'yandex.ru',
+    'zoho.com',
+}
+
+# Base names (without TLD) of providers with plus addressing on every country domain
+PLUS_ADDRESSING_BASES = {'hotmail', 'outlook', 'live'}
+
+
+def _supports_plus(domain: str) -> bool:
+    if domain in PLUS_ADDRESSING_DOMAINS:
+        return True
+    # Brand directly under a public suffix: hotmail.fr, outlook.co.uk (not live.acme.com)
+    forms = domain_forms(domain)
+    return forms is not None and forms.registrable == domain \
+        and domain.split('.', 1)[0] in PLUS_ADDRESSING_BASES
+
+
+def _malformed_dots(local: str) -> bool:
+    return local.startswith('.') or local.endswith('.') or '..' in local
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_email(email: str) -> str:
+    """
+    Canonical form of an address. Addresses without an '@' come back stripped but
+    otherwise unchanged, so they still fail syntax validation downstream.
+    """
+    email = (email or '').strip()
+    local, at, domain = email.rpartition('@')
+    if not at or not local:
+        return email
+
+    # IDN domains in their ASCII (punycode) form, which DNS and SMTP use
+    forms = domain_forms(domain)
+    domain = forms.ascii if forms else domain.rstrip('.').casefold()
+    domain = DOMAIN_ALIASES.get(domain, domain)
+    # Mailbox names are case-insensitive at every provider we probe; lower(), not
+    # casefold(), which would turn straße into strasse (a different mailbox)
+    local = local.lower()
+    # Leave malformed dot placement alone so syntax validation still rejects it
+    if _malformed_dots(local):
+        return f"{local}@{domain}"
+
+    mailbox = local
+    if _supports_plus(domain) and '+' in mailbox:
+        mailbox = mailbox.split('+', 1)[0] or mailbox
+    if domain in DOT_INSENSITIVE_DOMAINS:
+        mailbox = mailbox.replace('.', '') or mailbox
+    # A valid address must stay valid: john.+x@outlook.com keeps its tag rather than
+    # becoming john.@outlook.com
+    if _malformed_dots(mailbox):
+        mailbox = local
+
+    return f"{mailbox}@{domain}"
+
@@ -294,10 +294,15 @@ class EmailFinderService:
                     
                     found_verified = False
                     
-                    # Check patterns up to max_patterns
-                    for candidate in patterns[:max_patterns]:
-                        logger.info(f"Verifying candidate: {candidate}")
-                        verification = await self.email_verifier.verify_email(candidate)
+                    # Verify all candidates in one batch (shared domain work and SMTP session),
+                    # then pick the first accepted one in pattern order
+                    candidates = patterns[:max_patterns]
+                    verifications = {}
+                    async for verification in self.email_verifier.verify_many(candidates):
+                        verifications[verification['email'].lower()] = verification
+                    
+                    for candidate in candidates:
+                        verification = verifications.get(candidate.lower(), {})
                         
                         if verification.get('final_status') == 'valid_safe':
                             # Found the correct email!
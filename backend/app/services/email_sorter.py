@@ -6,6 +6,11 @@ Supports: Office 365, G Suite, Titan Email, and other providers
 from typing import List, Dict, Tuple
 import dns.resolver
 
+from app.services.provider_index import provider_index
+
+# Sorter category -> provider index key
+SORTER_ALIASES = {'office365': 'microsoft', 'gsuite': 'google'}
+
 
 class EmailSorterService:
     """
@@ -16,53 +21,6 @@ class EmailSorterService:
     - Other providers
     """
     
-    # Known consumer domains (instant detection)
-    OFFICE365_CONSUMER_DOMAINS = {
-        'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
-        'office365.com', 'onmicrosoft.com'
-    }
-    
-    GSUITE_CONSUMER_DOMAINS = {
-        'gmail.com', 'googlemail.com'
-    }
-    
-    # MX record patterns for provider detection
-    PROVIDER_MX_PATTERNS = {
-        'office365': [
-            '.mail.protection.outlook.com',
-            '.onmicrosoft.com',
-            'outlook.com'
-        ],
-        'gsuite': [
-            'google.com',
-            'googlemail.com',
-            'aspmx.l.google.com',
-            'aspmx2.googlemail.com',
-            'aspmx3.googlemail.com'
-        ],
-        'titan': [
-            'titan.email',
-            'flock.email',
-            'mx1.titan.email',
-            'mx2.titan.email'
-        ],
-        'zoho': [
-            'zoho.com',
-            'zoho.eu',
-            'mx.zoho.com'
-        ],
-        'protonmail': [
-            'protonmail.ch',
-            'mail.protonmail.ch'
-        ],
-        'yahoo': [
-            'yahoodns.net',
-            'mta5.am0.yahoodns.net',
-            'mta6.am0.yahoodns.net',
-            'mta7.am0.yahoodns.net'
-        ]
-    }
-    
     def __init__(self):
         self.mx_cache = {}
         # Configure custom DNS resolver with public DNS servers
@@ -111,16 +69,11 @@ class EmailSorterService:
             tld = domain.split('.')[-1]
             
             # Check known consumer domains first (no MX lookup needed)
-            if domain in self.OFFICE365_CONSUMER_DOMAINS:
+            provider = provider_index.domain_provider(domain)
+            if provider:
                 return self._create_result(
-                    email, domain, tld, 'office365',
-                    'Microsoft 365', 'known_domain'
-                )
-            
-            if domain in self.GSUITE_CONSUMER_DOMAINS:
-                return self._create_result(
-                    email, domain, tld, 'gsuite',
-                    'Google Workspace', 'known_domain'
+                    email, domain, tld, provider_index.category(provider),
+                    provider_index.name(provider), 'known_domain'
                 )
             
             # For custom domains, check MX records
@@ -162,15 +115,13 @@ class EmailSorterService:
             
             primary_mx = mx_hosts[0]
             
-            # Check each provider pattern
-            for provider, patterns in self.PROVIDER_MX_PATTERNS.items():
-                for pattern in patterns:
-                    for mx_host in mx_hosts:
-                        if pattern in mx_host:
-                            provider_name = self._get_provider_name(provider)
-                            result = (provider, provider_name, 'mx_records', primary_mx)
-                            self.mx_cache[domain] = result
-                            return result
+            # Shared provider index (suffix match, memoised per MX host)
+            provider = provider_index.classify('', mx_hosts)
+            if provider:
+                category = provider_index.category(provider)
+                result = (category, self._get_provider_name(provider), 'mx_records', primary_mx)
+                self.mx_cache[domain] = result
+                return result
             
             # No known provider matched
             result = ('other', f'Custom Mail Server', 'mx_records', primary_mx)
@@ -191,16 +142,20 @@ class EmailSorterService:
             return result
     
     def _get_provider_name(self, provider_key: str) -> str:
-        """Get friendly provider name"""
+        """Get friendly provider name (provider index key or sorter category)"""
+        provider_key = SORTER_ALIASES.get(provider_key, provider_key)
         provider_names = {
-            'office365': 'Microsoft 365 (Custom Domain)',
-            'gsuite': 'Google Workspace (Custom Domain)',
+            'microsoft': 'Microsoft 365 (Custom Domain)',
+            'google': 'Google Workspace (Custom Domain)',
             'titan': 'Titan Email',
             'zoho': 'Zoho Mail',
             'protonmail': 'ProtonMail',
             'yahoo': 'Yahoo Mail'
         }
-        return provider_names.get(provider_key, 'Unknown Provider')
+        name = provider_names.get(provider_key)
+        if name is None and provider_key in provider_index.providers:
+            name = provider_index.name(provider_key)
+        return name or 'Unknown Provider'
     
     def _create_result(
         self,
@@ -8,18 +8,79 @@ import re
 import dns.resolver
 import smtplib
 import socket
-import requests
 import random
 import string
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, Tuple, Optional
-from email_validator import validate_email, EmailNotValidError
-import aiosmtplib
-from app.services.office365_checker import office365_checker
-from app.services.gmail_checker import gmail_checker
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 from app.services.avatar_checker import avatar_checker
+from app.services.batch_scoring import batch_scorer
+from app.services.checker_registry import checker_registry
+from app.services.email_canonicalizer import canonicalize_email
+from app.services.http_client import http_client
+from app.services.provider_index import provider_index
+from app.services.result_cache import RESULT_CACHE_DEPTHS, result_cache
+from app.services.role_detector import role_detector
+from app.services.deadline import Deadline, DeadlineExceeded, VERIFY_DEADLINE_SECONDS
+from app.services.disposable_index import disposable_index
+from app.services.domain_normalizer import to_ascii
+from app.services.smtp_agent import smtp_dispatcher
+from app.services.smtp_prober import PROBE_TIMEOUT
+from app.services.smtp_reply_classifier import SmtpReason, classify_reply
+from app.services.spam_trap_index import spam_trap_index
+from app.services.syntax_validator import syntax_validator
+from app.services.verification_result import VerificationResult
+from app.services.typo_suggester import TYPO_SKIP_PROBES, typo_index
+
+logger = logging.getLogger(__name__)
+
+# Domain groups verified concurrently by verify_many
+VERIFY_MANY_CONCURRENCY = 10
+
+# How far a verification goes (each tier includes the ones before it):
+#   syntax   - syntax, disposable and role checks only (no network)
+#   dns      - + domain and MX lookups
+#   standard - + provider checks, SMTP, catch-all and O365 (social only for catch-all domains)
+#   deep     - + social presence lookup for every address that reaches the SMTP phase
+VERIFICATION_DEPTHS = ('syntax', 'dns', 'standard', 'deep')
+DEFAULT_DEPTH = 'standard'
+
+# Where answers may come from:
+#   live        - the checks above, over the network
+#   cached_only - local checks plus cached domain and mailbox facts (domain cache, result
+#                 cache, catch-all registry); no network I/O. Results carry `freshness`.
+VERIFICATION_MODES = ('live', 'cached_only')
+DEFAULT_MODE = 'live'
+# cached_only also answers from domain facts this old (the live pipeline re-resolves after the TTL)
+CACHED_ONLY_DOMAIN_MAX_AGE = int(os.getenv('CACHED_ONLY_DOMAIN_MAX_AGE', str(24 * 3600)))
+# Fields describing the request, not the mailbox: a cached verdict never overrides them
+REQUEST_FIELDS = {'email', 'depth', 'canonical_email', 'did_you_mean'}
+
+# Per-step caps; each step also stops when the verification's deadline does
+O365_TIMEOUT = 3
+SOCIAL_TIMEOUT = 5
+
+# SMTP answers that settle the mailbox; a speculative social lookup is pointless after one
+SMTP_DEFINITIVE_FAILURES = frozenset({
+    'user_not_found', 'invalid_mailbox', 'account_disabled', 'mailbox_full', 'rejected'
+})
+
+# Single verifications: when the provider checks are still pending after their p90 latency,
+# start the SMTP probe as well and take the first definitive answer (see _hedged_checkers)
+HEDGE_SMTP = os.getenv('HEDGE_SMTP', 'false').lower() == 'true'
+
+
+def _freshness(source: str, checked_at: Optional[float] = None) -> Dict:
+    """Where a cached_only answer came from and how old its evidence is"""
+    checked_at = checked_at or time.time()
+    return {
+        'source': source,  # local, domain_cache or result_cache
+        'checked_at': datetime.fromtimestamp(checked_at, timezone.utc).isoformat(),
+        'age_seconds': max(0, int(time.time() - checked_at)),
+    }
 
 
 class DomainCache:
@@ -35,6 +96,13 @@ class DomainCache:
             return entry['value']
         return None
     
+    def entry(self, domain: str, key: str, max_age: Optional[float] = None) -> Optional[Tuple[object, float]]:
+        """(value, stored-at epoch) up to max_age seconds old (default: the TTL), or None"""
+        entry = self._cache.get(f"{domain}:{key}")
+        if entry and (time.time() - entry['ts']) < (self._ttl if max_age is None else max_age):
+            return entry['value'], entry['ts']
+        return None
+    
     def set(self, domain: str, key: str, value):
         self._cache[f"{domain}:{key}"] = {'value': value, 'ts': time.time()}
 
@@ -59,196 +127,694 @@ class EmailVerificationService:
     - Reduced timeouts
     """
     
-    # Common role-based prefixes
-    ROLE_BASED_PREFIXES = {
-        'admin', 'administrator', 'info', 'support', 'sales', 'contact',
-        'help', 'service', 'noreply', 'no-reply', 'postmaster', 'webmaster',
-        'marketing', 'billing', 'abuse', 'security', 'privacy'
-    }
-    
     def __init__(self):
         self.user_agent = 'Microsoft Office/16.0 (Windows NT 10.0; Microsoft Outlook 16.0.12026; Pro)'
         self.headers = {'User-Agent': self.user_agent, 'Accept': 'application/json'}
         self.domain_cache_old = {}  # Legacy O365 cache
         self.cache = DomainCache(ttl_seconds=3600)  # 1-hour TTL
         
-        # Load disposable domains from file (5000+ domains)
-        self.disposable_domains = self._load_disposable_domains()
-    
-    def _load_disposable_domains(self) -> set:
-        """Load disposable email domains from file"""
-        import os
-        
-        file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'disposable_domains.txt')
-        
-        try:
-            with open(file_path, 'r') as f:
-                domains = {line.strip().lower() for line in f if line.strip()}
-            print(f"✅ Loaded {len(domains)} disposable email domains")
-            return domains
-        except FileNotFoundError:
-            print(f"⚠️ Disposable domains file not found at {file_path}, using fallback list")
-            return {
-                'tempmail.com', 'guerrillamail.com', '10minutemail.com', 'mailinator.com',
-                'throwaway.email', 'temp-mail.org', 'getnada.com', 'maildrop.cc',
-                'yopmail.com', 'fakeinbox.com', 'trashmail.com', 'sharklasers.com'
-            }
-        except Exception as e:
-            print(f"⚠️ Error loading disposable domains: {e}")
-            return set()
+        # Disposable domains: file + DB table, parent-domain matching, hot reload
+        self.disposable_index = disposable_index
+        self.hedge_smtp = HEDGE_SMTP
     
-    async def verify_email(self, email: str) -> Dict:
+    async def verify_email(self, email: str, depth: str = DEFAULT_DEPTH, deadline: Optional[Deadline] = None,
+                           mode: str = DEFAULT_MODE) -> Dict:
         """
         Perform comprehensive email verification with caching and parallelism.
+        `depth` (see VERIFICATION_DEPTHS) controls how many phases run; every phase shares
+        one `deadline` (default VERIFY_DEADLINE_SECONDS) and a partial verdict is returned
+        when it runs out. `mode` (see VERIFICATION_MODES) 'cached_only' answers without
+        network I/O.
         Returns detailed validation results.
         """
-        result = {
-            'email': email,
-            'syntax': 'unknown',
-            'domain': 'unknown',
-            'mx': 'unknown',
-            'mx_records': [],
-            'smtp': 'unknown',
-            'smtp_provider': None,
-            'catch_all': False,
-            'disposable': False,
-            'role_based': False,
-            'is_o365': False,
-            'spam_risk': 'unknown',
-            'final_status': 'unknown',
-            'safety_score': 0,
-            'reason': None,
-            'has_social': False,
-            'social_platform': None,
-            'details': {}
-        }
+        if depth not in VERIFICATION_DEPTHS:
+            raise ValueError(f"Unknown verification depth: {depth}")
+        if mode not in VERIFICATION_MODES:
+            raise ValueError(f"Unknown verification mode: {mode}")
+        await self._load_local_indexes()
+        if mode == 'cached_only':
+            if depth in RESULT_CACHE_DEPTHS:
+                await result_cache.load_history_async([email])
+            return self._verify_cached(email, depth)
+        
+        result = self._new_result(email, depth)
+        deadline = deadline or Deadline()
+        phase = 'syntax'
+        social_task = None
+        smtp_task = None
         
         try:
             # ── Phase 1: Quick local checks (instant) ──────────────────
-            syntax_valid, syntax_msg = self._validate_syntax(email)
-            result['syntax'] = 'valid' if syntax_valid else 'invalid'
-            result['details']['syntax'] = syntax_msg
+            if self._apply_local_checks(result, email):
+                return result
             
-            if not syntax_valid:
-                result['final_status'] = 'invalid_syntax'
-                result['safety_score'] = 0
+            if depth == 'syntax':
+                self._finish_shallow(result)
                 return result
             
+            # Network phases use the ASCII (punycode) form of the domain
             local, domain = email.split('@')
-            
-            # These are instant — run synchronously
-            result['disposable'] = self._is_disposable(domain)
-            result['role_based'] = self._is_role_based(local)
-            
-            if result['disposable']:
-                result['spam_risk'] = 'high'
-                result['safety_score'] = 20
+            domain = to_ascii(domain)
+            email = f"{local}@{domain}"
             
             # ── Phase 2: Domain + MX (cached or parallel) ────────────
-            domain_valid, domain_msg = self._validate_domain_cached(domain)
-            result['domain'] = 'valid' if domain_valid else 'invalid'
-            result['details']['domain'] = domain_msg
-            
-            if not domain_valid:
-                result['final_status'] = 'invalid_domain'
-                result['safety_score'] = 10
+            phase = 'dns'
+            # Lookups are blocking: resolve off the event loop, within the budget
+            await deadline.run(asyncio.to_thread(self._prefetch_domain, domain, depth != 'dns'))
+            if self._apply_domain_checks(result, domain):
                 return result
             
-            mx_valid, mx_records = self._check_mx_cached(domain)
-            result['mx'] = 'found' if mx_valid else 'not_found'
-            result['mx_records'] = mx_records
-            result['details']['mx_records'] = mx_records
-            
-            if mx_records:
-                result['smtp_provider'] = self._extract_smtp_provider(mx_records[0])
-            
-            if not mx_valid:
-                result['final_status'] = 'no_mx_records'
-                result['safety_score'] = 15
-                result['reason'] = 'No MX records found'
+            if depth == 'dns':
+                self._finish_shallow(result)
                 return result
             
+            mx_records = result['mx_records']
+            
             # ── Phase 3: Provider-specific check (uses cache) ────────
-            specialized_check_result = await self._use_specialized_checker(email, domain, mx_records)
-            if specialized_check_result:
-                result['details']['specialized_check'] = specialized_check_result
-                
-                is_catch_all = specialized_check_result.get('catch_all', False)
-                if is_catch_all:
-                    result['catch_all'] = True
-                
-                if specialized_check_result.get('valid') is not None:
-                    result['smtp'] = 'valid' if specialized_check_result['valid'] else 'invalid'
-                    result['details']['smtp'] = f"Verified via {specialized_check_result['method']}: {specialized_check_result['details']}"
-                    
-                    if specialized_check_result['valid']:
-                        method = specialized_check_result.get('method', '')
-                        
-                        if 'microsoft_login_api' in method:
-                            result['final_status'] = 'valid_safe'
-                            result['safety_score'] = 90 if not result['role_based'] else 80
-                            result['spam_risk'] = 'low'
-                            result['reason'] = 'Confirmed via Microsoft Login API'
-                        elif is_catch_all:
-                            result['final_status'] = 'valid_risky'
-                            result['safety_score'] = 60
-                            result['spam_risk'] = 'medium'
-                        else:
-                            result['final_status'] = 'valid_safe'
-                            result['safety_score'] = 95 if not result['role_based'] else 85
-                            result['spam_risk'] = 'low'
-                    else:
-                        result['final_status'] = 'invalid'
-                        result['safety_score'] = 10
-                        result['spam_risk'] = 'high'
-                    
-                    if 'office365' in specialized_check_result['method']:
-                        result['is_o365'] = True
-                    
-                    return result
+            phase = 'provider'
+            if self.hedge_smtp:
+                specialized_check_result, smtp_task = await deadline.run(
+                    self._hedged_checkers(email, domain, mx_records, deadline)
+                )
+            else:
+                specialized_check_result = await deadline.run(
+                    self._run_checkers(email, domain, mx_records)
+                )
+            if self._apply_specialized_result(result, specialized_check_result):
+                return result
             
             # ── Phase 4: SMTP + Catch-all + O365 + Social (parallel) ─
+            phase = 'smtp'
             mx_host = mx_records[0] if mx_records else None
             
             # Run SMTP, O365 check, and social check in parallel
-            smtp_task = self._verify_smtp(email, mx_host)
-            o365_task = self._check_o365_cached(email, domain)
+            # Without port-25 egress (locally or on a probe agent) every probe would just
+            # time out, so skip SMTP and rely on the specialized checkers plus cached domain intelligence
+            smtp_egress_ok = await deadline.run(smtp_dispatcher.is_available())
+            o365_task = self._check_o365_cached(email, domain, deadline.timeout(O365_TIMEOUT))
+            # Catch-all results always need the social lookup: start it now instead of after SMTP
+            social_task = self._start_social_check(email, domain, depth, deadline)
             
-            smtp_result, is_o365 = await asyncio.gather(smtp_task, o365_task)
-            smtp_valid, smtp_msg = smtp_result
+            if smtp_egress_ok:
+                # A hedged probe started in Phase 3 is reused, never repeated
+                smtp_task = smtp_task or self._verify_smtp(email, mx_host, deadline.timeout(PROBE_TIMEOUT))
+                smtp_result, is_o365 = await deadline.run(asyncio.gather(smtp_task, o365_task))
+                smtp_valid, smtp_msg = smtp_result
+                if not smtp_valid and smtp_msg == 'unreachable' and deadline.expired():
+                    # The probe gave up because the budget did, not because the server did
+                    raise DeadlineExceeded()
+            else:
+                is_o365 = await deadline.run(o365_task)
+                smtp_valid, smtp_msg = False, 'unreachable'
+                result['details']['smtp_skipped'] = 'SMTP egress (port 25) unavailable'
             
-            result['smtp'] = smtp_msg
-            result['details']['smtp'] = smtp_msg
-            result['is_o365'] = is_o365
+            await self._finish_smtp_phase(
+                result, email, domain, mx_host, smtp_valid, smtp_msg, is_o365, depth,
+                deadline=deadline, social_task=social_task
+            )
             
-            # Catch-all check (uses cache)
-            if smtp_valid:
-                result['catch_all'] = await self._check_catch_all_cached(domain, mx_host)
+        except DeadlineExceeded:
+            self._finish_partial(result, phase, deadline)
+        except Exception as e:
+            result['details']['error'] = str(e)
+            result['final_status'] = 'error'
+        finally:
+            for task in (social_task, smtp_task):
+                if isinstance(task, asyncio.Future) and not task.done():
+                    task.cancel()
+            result_cache.put(result)
+        
+        return result
+    
+    async def verify_many(self, emails: Iterable[str], options: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Verify many addresses through one shared engine, yielding results as they finish.
+        
+        Input is canonicalised (see email_canonicalizer) so each mailbox is verified once and
+        its result is yielded for every input spelling, then grouped by domain: each group does its domain work once and probes all of
+        its addresses (plus the catch-all test address) over a single SMTP session.
+        
+        Options:
+            concurrency: how many domain groups run at once (default VERIFY_MANY_CONCURRENCY)
+            depth: verification tier, as for verify_email (default DEFAULT_DEPTH)
+            deadline: seconds each domain group may take, counted from when it starts
+                      (default VERIFY_DEADLINE_SECONDS); late addresses get a partial verdict
+            mode: 'live' or 'cached_only', as for verify_email (default DEFAULT_MODE)
+        """
+        options = options or {}
+        concurrency = int(options.get('concurrency', VERIFY_MANY_CONCURRENCY))
+        budget = float(options.get('deadline', VERIFY_DEADLINE_SECONDS))
+        depth = options.get('depth', DEFAULT_DEPTH)
+        mode = options.get('mode', DEFAULT_MODE)
+        if depth not in VERIFICATION_DEPTHS:
+            raise ValueError(f"Unknown verification depth: {depth}")
+        if mode not in VERIFICATION_MODES:
+            raise ValueError(f"Unknown verification mode: {mode}")
+        
+        groups, variants = self._group_by_domain(emails)
+        total = sum(len(v) for v in variants.values())
+        if not total:
+            return
+        await self._load_local_indexes()
+        
+        if mode == 'cached_only':
+            # No network: one history lookup for the whole list, then answer in place
+            if depth in RESULT_CACHE_DEPTHS:
+                await result_cache.load_history_async(e for spellings in variants.values() for e in spellings)
+            answered = []
+            for group in groups.values():
+                for email in group:
+                    self._fan_out(self._verify_cached(email, depth), variants, answered.append)
+            for result in answered:
+                yield result
+            return
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        def emit(result: Dict):
+            result_cache.put(result)
+            self._fan_out(result, variants, queue.put_nowait)
+        
+        async def run_group(domain: str, group: List[str]):
+            async with semaphore:
+                await self._verify_domain_group(domain, group, emit, depth, Deadline(budget))
+        
+        tasks = [asyncio.ensure_future(run_group(domain, group)) for domain, group in groups.items()]
+        try:
+            for _ in range(total):
+                yield await queue.get()
+        finally:
+            # Consumer stopped early (or we are done): don't leave probes running
+            for task in tasks:
+                task.cancel()
+    
+    # ── Pipeline phases ────────────────────────────────────────────────
+    
+    def _new_result(self, email: str, depth: str = DEFAULT_DEPTH) -> VerificationResult:
+        return VerificationResult(email, depth)
+    
+    async def _load_local_indexes(self):
+        """Load the Phase 1 lookup tables off the event loop; later refreshes run in the background"""
+        await self.disposable_index.ensure_loaded()
+        await spam_trap_index.ensure_loaded()
+    
+    def _apply_local_checks(self, result: Dict, email: str, syntax: Optional[Tuple[bool, str]] = None) -> bool:
+        """
+        Phase 1: syntax, disposable and role checks. Returns True when the verdict is final.
+        `syntax` is a verdict already computed by syntax_validator.validate_many.
+        """
+        syntax_valid, syntax_msg = syntax or self._validate_syntax(email)
+        result['syntax'] = 'valid' if syntax_valid else 'invalid'
+        result['details']['syntax'] = syntax_msg
+        
+        if not syntax_valid:
+            result['final_status'] = 'invalid_syntax'
+            result['safety_score'] = 0
+            return True
+        
+        local, domain = email.split('@')
+        domain = to_ascii(domain)
+        
+        # These are instant — run synchronously
+        result['disposable'] = self._is_disposable(domain)
+        result['role_based'] = self._is_role_based(local)
+        
+        if result['disposable']:
+            result['spam_risk'] = 'high'
+            result['safety_score'] = 20
+        
+        # Known spam traps: never probe them, a confirmed one is final
+        trap_risk = spam_trap_index.lookup(email)
+        if trap_risk:
+            result['spam_trap'] = trap_risk
+            result['spam_risk'] = 'high'
+            if trap_risk == 'high':
+                result['final_status'] = 'spam_trap'
+                result['safety_score'] = 0
+                result['reason'] = 'Known spam trap'
+                return True
+        
+        # Misspelt provider domains (gmial.com): suggest the fix before any network work
+        suggestion = typo_index.suggest(domain)
+        if suggestion and not self._has_cached_mx(domain):
+            result['did_you_mean'] = f"{local}@{suggestion}"
+            result['details']['typo_suggestion'] = suggestion
+            if TYPO_SKIP_PROBES and typo_index.is_obvious_typo(domain):
+                result['final_status'] = 'invalid'
+                result['safety_score'] = 10
+                result['spam_risk'] = 'high'
+                result['reason'] = f"Misspelt domain - did you mean {suggestion}?"
+                return True
+        return False
+    
+    def _apply_domain_checks(self, result: Dict, domain: str, facts: Optional[Tuple] = None) -> bool:
+        """
+        Phase 2: domain and MX lookups (cached). Returns True when the verdict is final.
+        `facts` is ((domain_valid, msg), (mx_valid, mx_records)) already looked up; MX is
+        only read when the domain is valid.
+        """
+        domain_valid, domain_msg = facts[0] if facts else self._validate_domain_cached(domain)
+        result['domain'] = 'valid' if domain_valid else 'invalid'
+        result['details']['domain'] = domain_msg
+        
+        if not domain_valid:
+            result['final_status'] = 'invalid_domain'
+            result['safety_score'] = 10
+            return True
+        
+        mx_valid, mx_records = facts[1] if facts else self._check_mx_cached(domain)
+        result['mx'] = 'found' if mx_valid else 'not_found'
+        result['mx_records'] = mx_records
+        result['details']['mx_records'] = mx_records
+        
+        if mx_records:
+            result['smtp_provider'] = self._extract_smtp_provider(mx_records[0])
+        
+        if mx_valid and result['did_you_mean']:
+            # A domain with its own MX is a real mail domain, not a typo
+            result['did_you_mean'] = None
+            result['details'].pop('typo_suggestion', None)
+        
+        if not mx_valid:
+            result['final_status'] = 'no_mx_records'
+            result['safety_score'] = 15
+            result['reason'] = 'No MX records found'
+            return True
+        return False
+    
+    def _prefetch_domain(self, domain: str, spf: bool = True):
+        """Warm the domain cache (blocking DNS) so Phase 2/3 for a whole group are cache hits"""
+        domain_valid, _ = self._validate_domain_cached(domain)
+        if domain_valid:
+            self._check_mx_cached(domain)
+            if spf:
+                self._spf_is_o365_cached(domain)
+    
+    def _finish_shallow(self, result: Dict, reason: Optional[str] = None):
+        """Verdict without mailbox evidence: the syntax / dns tiers, or a deadline hit before it"""
+        if result['disposable']:
+            status, score, reason = 'disposable', 30, 'Disposable email address'
+        else:
+            # No mailbox evidence either way: only bad addresses are ruled out
+            status = 'unknown'
+            if result['mx'] == 'found':
+                score, default_reason = 60, 'Domain accepts mail; mailbox not checked'
+            else:
+                score, default_reason = 50, 'Syntax valid; domain and mailbox not checked'
+            if result['role_based']:
+                score -= 10
+            reason = reason or default_reason
+        result['final_status'], result['safety_score'], result['reason'] = status, score, reason
+        result['spam_risk'] = self._assess_spam_risk(result)
+    
+    def _finish_partial(self, result: Dict, phase: str, deadline: Deadline):
+        """Best verdict from the phases that finished before the deadline"""
+        result['partial'] = True
+        result['details']['deadline_exceeded'] = f"{phase} ({deadline.budget:g}s budget)"
+        self._finish_shallow(result, f"Verification deadline reached during {phase} check")
+    
+    def _verify_cached(self, email: str, depth: str) -> VerificationResult:
+        """
+        cached_only mode: local checks, then the cached verdict for the mailbox (standard and
+        deep depth), else cached domain facts plus the catch-all registry. Never does network I/O.
+        """
+        from app.services.catch_all_db import is_known_catch_all
+        result = self._new_result(email, depth)
+        if self._apply_local_checks(result, email):
+            result['freshness'] = _freshness('local')
+            return result
+        if depth == 'syntax':
+            self._finish_shallow(result)
+            result['freshness'] = _freshness('local')
+            return result
+        
+        if depth in RESULT_CACHE_DEPTHS:
+            hit = result_cache.get(email)
+            if hit:
+                cached, verified_at = hit
+                result.update((key, value) for key, value in cached.items() if key not in REQUEST_FIELDS)
+                result['freshness'] = _freshness('result_cache', verified_at)
+                return result
+        
+        domain = to_ascii(email.split('@')[1])
+        domain_fact = self.cache.entry(domain, 'domain_valid', CACHED_ONLY_DOMAIN_MAX_AGE)
+        mx_fact = self.cache.entry(domain, 'mx', CACHED_ONLY_DOMAIN_MAX_AGE)
+        if domain_fact is None or (domain_fact[0][0] and mx_fact is None):
+            self._finish_shallow(result, 'No cached data for this domain; domain and mailbox not checked')
+            result['freshness'] = _freshness('local')
+            return result
+        
+        checked_at = min(domain_fact[1], mx_fact[1]) if mx_fact else domain_fact[1]
+        result['freshness'] = _freshness('domain_cache', checked_at)
+        if self._apply_domain_checks(result, domain, (domain_fact[0], mx_fact[0] if mx_fact else None)):
+            return result
+        
+        catch_all = self.cache.entry(domain, 'catch_all', CACHED_ONLY_DOMAIN_MAX_AGE)
+        if catch_all is not None and catch_all[0]:
+            result['catch_all'] = True
+            result['details']['catch_all_source'] = 'domain_cache'
+        elif is_known_catch_all(domain):
+            result['catch_all'] = True
+            result['details']['catch_all_source'] = 'known_database'
+        self._finish_shallow(result)
+        return result
+    
+    def _apply_specialized_result(self, result: Dict, specialized_check_result: Optional[Dict]) -> bool:
+        """Phase 3: fold in a provider-specific check. Returns True when the verdict is final."""
+        if not specialized_check_result:
+            return False
+        
+        result['details']['specialized_check'] = specialized_check_result
+        
+        is_catch_all = specialized_check_result.get('catch_all', False)
+        if is_catch_all:
+            result['catch_all'] = True
+        
+        if specialized_check_result.get('valid') is None:
+            return False
+        
+        result['smtp'] = 'valid' if specialized_check_result['valid'] else 'invalid'
+        result['details']['smtp'] = f"Verified via {specialized_check_result['method']}: {specialized_check_result['details']}"
+        
+        if specialized_check_result['valid']:
+            method = specialized_check_result.get('method', '')
+            
+            if 'microsoft_login_api' in method:
+                result['final_status'] = 'valid_safe'
+                result['safety_score'] = 90 if not result['role_based'] else 80
+                result['spam_risk'] = 'low'
+                result['reason'] = 'Confirmed via Microsoft Login API'
+            elif is_catch_all:
+                result['final_status'] = 'valid_risky'
+                result['safety_score'] = 60
+                result['spam_risk'] = 'medium'
+            else:
+                result['final_status'] = 'valid_safe'
+                result['safety_score'] = 95 if not result['role_based'] else 85
+                result['spam_risk'] = 'low'
+        else:
+            result['final_status'] = 'invalid'
+            result['safety_score'] = 10
+            result['spam_risk'] = 'high'
+        
+        if 'office365' in specialized_check_result['method']:
+            result['is_o365'] = True
+        
+        return True
+    
+    async def _finish_smtp_phase(
+        self,
+        result: Dict,
+        email: str,
+        domain: str,
+        mx_host: Optional[str],
+        smtp_valid: bool,
+        smtp_msg: str,
+        is_o365: bool,
+        depth: str = DEFAULT_DEPTH,
+        catch_all_probe: Optional[bool] = None,
+        deadline: Optional[Deadline] = None,
+        social_task: Optional[asyncio.Task] = None,
+        score: bool = True
+    ):
+        """
+        Phase 4 tail + Phase 5: catch-all, social presence and final scoring.
+        `social_task` is a social lookup started speculatively alongside SMTP, if any.
+        With score=False the caller scores the result (batch_scorer, for a whole chunk).
+        """
+        result['smtp'] = smtp_msg
+        result['details']['smtp'] = smtp_msg
+        result['is_o365'] = is_o365
+        deadline = deadline or Deadline()
+        
+        definitive = smtp_msg in SMTP_DEFINITIVE_FAILURES and depth != 'deep'
+        if definitive and social_task is not None:
+            # SMTP settled it: don't keep the speculative lookup running through the catch-all step
+            social_task.cancel()
+            social_task = None
+        
+        # Catch-all check (uses cache, or the group's shared probe)
+        if smtp_valid and catch_all_probe is None:
+            try:
+                catch_all_probe = await deadline.run(
+                    self._check_catch_all_cached(domain, mx_host, deadline.timeout(PROBE_TIMEOUT))
+                )
+            except asyncio.TimeoutError:
+                result['details']['catch_all_skipped'] = 'deadline'
+        
+        if smtp_valid and catch_all_probe is not None:
+            result['catch_all'] = catch_all_probe
+        else:
+            from app.services.catch_all_db import is_known_catch_all
+            cached_catch_all = self.cache.get(domain, 'catch_all')
+            if cached_catch_all:
+                result['catch_all'] = True
+                result['details']['catch_all_source'] = 'domain_cache'
             else:
-                from app.services.catch_all_db import is_known_catch_all
                 result['catch_all'] = is_known_catch_all(domain)
                 if result['catch_all']:
                     result['details']['catch_all_source'] = 'known_database'
-            
-            # Social check for uncertain results
-            if result['catch_all'] or result['final_status'] == 'unknown':
-                social_result = await avatar_checker.check_social_presence(email)
-                if social_result['has_social']:
-                    result['has_social'] = True
-                    result['social_platform'] = social_result['platform']
-                    result['details']['social'] = social_result['details']
-                    result['safety_score'] = max(result['safety_score'], 90)
-                    result['final_status'] = 'valid_safe'
-            
-            # ── Phase 5: Final scoring ───────────────────────────────
+        
+        # Social check for uncertain results: catch-all domains, or everything at deep depth
+        if depth == 'deep' or (result['catch_all'] and not definitive):
+            if social_task is None:
+                social_task = asyncio.ensure_future(
+                    avatar_checker.check_social_presence(email, deadline.timeout(SOCIAL_TIMEOUT))
+                )
+            try:
+                social_result = await deadline.run(social_task)
+            except asyncio.TimeoutError:
+                social_task.cancel()
+                social_result = {'has_social': False}
+                result['details']['social_skipped'] = 'deadline'
+            if social_result['has_social']:
+                result['has_social'] = True
+                result['social_platform'] = social_result['platform']
+                result['details']['social'] = social_result['details']
+                result['safety_score'] = max(result['safety_score'], 90)
+                result['final_status'] = 'valid_safe'
+        
+        elif social_task is not None:
+            social_task.cancel()
+        
+        # ── Phase 5: Final scoring ───────────────────────────────
+        if score:
             result['final_status'], result['safety_score'], result['reason'] = self._calculate_final_status(result)
             result['spam_risk'] = self._assess_spam_risk(result)
+    
+    def _start_social_check(self, email: str, domain: str, depth: str,
+                            deadline: Deadline) -> Optional[asyncio.Task]:
+        """Start the social lookup speculatively when the domain is known or likely catch-all"""
+        from app.services.catch_all_db import is_known_catch_all
+        if depth != 'deep' and not (self.cache.get(domain, 'catch_all') or is_known_catch_all(domain)):
+            return None
+        return asyncio.ensure_future(
+            avatar_checker.check_social_presence(email, deadline.timeout(SOCIAL_TIMEOUT))
+        )
+    
+    # ── Batch engine ───────────────────────────────────────────────────
+    
+    def _group_by_domain(self, emails: Iterable[str]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Canonicalise, dedupe and group addresses by domain.
+        Returns (domain -> canonical addresses, canonical address -> input rows). Every input
+        row is kept, duplicates included, so each one gets its own result.
+        """
+        groups: Dict[str, List[str]] = {}
+        variants: Dict[str, List[str]] = {}
+        for raw in emails:
+            email = (raw or '').strip()
+            local, at, domain = email.rpartition('@')
+            if at:
+                email = f"{local}@{domain.lower()}"
+            canonical = canonicalize_email(email)
+            known = variants.get(canonical)
+            if known is None:
+                variants[canonical] = [email]
+                groups.setdefault(canonical.rpartition('@')[2] if '@' in canonical else '', []).append(canonical)
+            else:
+                known.append(email)
+        return groups, variants
+    
+    def _fan_out(self, result: Dict, variants: Dict[str, List[str]], emit: Callable[[Dict], None]):
+        """Emit one mailbox's result for every input row of it"""
+        canonical = result['email']
+        original_sent = False
+        for variant in variants.get(canonical, [canonical]):
+            if variant == canonical and not original_sent:
+                original_sent = True
+                emit(result)
+            else:
+                duplicate = result.copy()
+                duplicate['email'] = variant
+                if variant != canonical:
+                    duplicate['canonical_email'] = canonical
+                emit(duplicate)
+    
+    async def _verify_domain_group(
+        self,
+        domain: str,
+        emails: List[str],
+        emit: Callable[[Dict], None],
+        depth: str = DEFAULT_DEPTH,
+        deadline: Optional[Deadline] = None
+    ):
+        """Run the pipeline for every address of one domain, sharing domain work and the SMTP session"""
+        deadline = deadline or Deadline()
+        emitted = set()
+        live: Dict[str, Dict] = {}  # results still in flight, finished partially on deadline
+        phase = 'syntax'
+        
+        def done(result: Dict):
+            emitted.add(result['email'])
+            live.pop(result['email'], None)
+            emit(result)
+        
+        try:
+            # Phase 1 for every address
+            pending = []
+            for email, syntax in zip(emails, syntax_validator.validate_many(emails)):
+                result = self._new_result(email, depth)
+                if self._apply_local_checks(result, email, syntax):
+                    done(result)
+                elif depth == 'syntax':
+                    self._finish_shallow(result)
+                    done(result)
+                else:
+                    pending.append(result)
+                    live[email] = result
+            if not pending:
+                return
             
+            # Phase 2 once per domain, off the event loop
+            phase = 'dns'
+            await deadline.run(asyncio.to_thread(self._prefetch_domain, domain, depth != 'dns'))
+            remaining = []
+            for result in pending:
+                if self._apply_domain_checks(result, domain):
+                    done(result)
+                elif depth == 'dns':
+                    self._finish_shallow(result)
+                    done(result)
+                else:
+                    remaining.append(result)
+            if not remaining:
+                return
+            
+            mx_records = remaining[0]['mx_records']
+            mx_host = mx_records[0] if mx_records else None
+            
+            # Phase 3: specialized checks for the whole group concurrently
+            phase = 'provider'
+            specialized = await deadline.run(asyncio.gather(*(
+                self._run_checkers(r['email'], domain, mx_records) for r in remaining
+            )))
+            undecided = []
+            for result, check in zip(remaining, specialized):
+                if self._apply_specialized_result(result, check):
+                    done(result)
+                else:
+                    undecided.append(result)
+            if not undecided:
+                return
+            
+            # Phase 4: one SMTP session for every address plus the catch-all test address
+            phase = 'smtp'
+            await self._smtp_phase(undecided, mx_host, depth, deadline, done)
+        
+        except DeadlineExceeded:
+            for result in list(live.values()):
+                self._finish_partial(result, phase, deadline)
+                done(result)
         except Exception as e:
-            result['details']['error'] = str(e)
-            result['final_status'] = 'error'
+            logger.error(f"verify_many group {domain} failed: {e}")
+            for email in emails:
+                if email not in emitted:
+                    result = self._new_result(email, depth)
+                    result['details']['error'] = str(e)
+                    result['final_status'] = 'error'
+                    done(result)
+    
+    async def _smtp_phase(
+        self,
+        rows: List[Dict],
+        mx_host: Optional[str],
+        depth: str,
+        deadline: Deadline,
+        done: Callable[[Dict], None]
+    ):
+        """
+        Phase 4 for rows that share one MX host (they may span several domains):
+        one SMTP session probes every address plus one catch-all test address per domain
+        whose catch-all status isn't cached yet. Raises DeadlineExceeded when the budget runs out.
+        """
+        emails = [r['email'] for r in rows]
+        domains = {e: e.rsplit('@', 1)[1] for e in emails}
+        o365_task = asyncio.gather(*(
+            self._check_o365_cached(e, domains[e], deadline.timeout(O365_TIMEOUT)) for e in emails
+        ))
+        social_tasks = {e: self._start_social_check(e, domains[e], depth, deadline) for e in emails}
         
-        return result
+        try:
+            smtp_outcomes = {}
+            catch_all = {d: self.cache.get(d, 'catch_all') for d in set(domains.values())}
+            if await deadline.run(smtp_dispatcher.is_available()):
+                test_addresses = {
+                    d: f"{''.join(random.choices(string.ascii_lowercase, k=20))}@{d}"
+                    for d, known in catch_all.items() if known is None
+                }
+                recipients = emails + list(test_addresses.values())
+                
+                replies, o365_flags = await deadline.run(asyncio.gather(
+                    smtp_dispatcher.probe(mx_host, recipients, deadline.timeout(PROBE_TIMEOUT))
+                    if mx_host else asyncio.sleep(0),
+                    o365_task
+                ))
+                if not replies and mx_host and deadline.expired():
+                    raise DeadlineExceeded()
+                for email in emails:
+                    if not mx_host:
+                        smtp_outcomes[email] = (False, 'no_mx')
+                    else:
+                        smtp_outcomes[email] = self._interpret_smtp_reply((replies or {}).get(email), mx_host)
+                
+                # The test address only means something if the server accepted a real one
+                for d, address in test_addresses.items():
+                    if any(smtp_outcomes[e][0] for e in emails if domains[e] == d):
+                        reply = (replies or {}).get(address)
+                        catch_all[d] = bool(reply) and reply['stage'] == 'rcpt' and \
+                            classify_reply(reply['code'], reply['message'], mx_host) == SmtpReason.VALID
+                        self.cache.set(d, 'catch_all', catch_all[d])
+            else:
+                o365_flags = await deadline.run(o365_task)
+                for result in rows:
+                    result['details']['smtp_skipped'] = 'SMTP egress (port 25) unavailable'
+                    smtp_outcomes[result['email']] = (False, 'unreachable')
+            
+            finished = []
+            
+            async def finish(result: Dict, is_o365: bool):
+                email = result['email']
+                smtp_valid, smtp_msg = smtp_outcomes[email]
+                await self._finish_smtp_phase(
+                    result, email, domains[email], mx_host, smtp_valid, smtp_msg, is_o365, depth,
+                    catch_all_probe=catch_all[domains[email]], deadline=deadline,
+                    social_task=social_tasks.get(email), score=False
+                )
+                finished.append(result)
+            
+            try:
+                await asyncio.gather(*(finish(r, flag) for r, flag in zip(rows, o365_flags)))
+            finally:
+                # Phase 5 for the whole chunk at once; rows finished before a deadline keep their verdict
+                batch_scorer.apply(finished)
+                for result in finished:
+                    done(result)
+        finally:
+            for task in social_tasks.values():
+                if task is not None and not task.done():
+                    task.cancel()
     
     # ── Cached domain lookups ──────────────────────────────────────────
     
@@ -270,34 +836,36 @@ class EmailVerificationService:
         self.cache.set(domain, 'mx', result)
         return result
     
-    async def _check_o365_cached(self, email: str, domain: str) -> bool:
+    def _has_cached_mx(self, domain: str) -> bool:
+        """MX records already known for the domain (cache only, no DNS)"""
+        cached = self.cache.get(domain, 'mx')
+        return bool(cached and cached[0])
+    
+    async def _check_o365_cached(self, email: str, domain: str, timeout: float = O365_TIMEOUT) -> bool:
         """Check O365 with domain-level caching"""
         cached = self.cache.get(domain, 'is_o365_domain')
         if cached is False:
             return False
-        result = await self._check_o365(email, domain)
+        result = await self._check_o365(email, domain, timeout)
         if not result:
             self.cache.set(domain, 'is_o365_domain', False)
         return result
     
-    async def _check_catch_all_cached(self, domain: str, mx_host: Optional[str]) -> bool:
+    async def _check_catch_all_cached(self, domain: str, mx_host: Optional[str],
+                                      timeout: float = PROBE_TIMEOUT) -> bool:
         """Check catch-all with domain-level caching"""
         cached = self.cache.get(domain, 'catch_all')
         if cached is not None:
             return cached
-        result = await self._check_catch_all(domain, mx_host)
+        result = await self._check_catch_all(domain, mx_host, timeout)
         self.cache.set(domain, 'catch_all', result)
         return result
     
     # ── Core checks ───────────────────────────────────────────────────
     
     def _validate_syntax(self, email: str) -> Tuple[bool, str]:
-        """Validate email syntax using email-validator library"""
-        try:
-            validate_email(email, check_deliverability=False)
-            return True, "Valid syntax"
-        except EmailNotValidError as e:
-            return False, str(e)
+        """Validate email syntax (compiled ASCII fast path, email-validator for the rest)"""
+        return syntax_validator.validate(email)
     
     def _validate_domain(self, domain: str) -> Tuple[bool, str]:
         """Validate domain exists and is reachable"""
@@ -327,50 +895,81 @@ class EmailVerificationService:
             print(f"MX lookup error for {domain}: {e}")
             return False, []
     
-    async def _use_specialized_checker(self, email: str, domain: str, mx_records: list) -> Optional[Dict]:
-        """Route email to specialized checker based on provider"""
-        # Match base domain names (without TLD) to cover international variants
-        # e.g. hotmail.fr, hotmail.co.uk, outlook.de, live.co.uk, etc.
-        o365_domain_bases = [
-            'outlook', 'hotmail', 'live', 'msn', 'office365', 'microsoft'
-        ]
-        
-        mx_is_o365 = any('outlook' in mx.lower() or 'microsoft' in mx.lower() for mx in mx_records)
-        domain_base = domain.lower().split('.')[0]
-        domain_is_o365 = domain_base in o365_domain_bases
-        
-        # Check SPF for O365 (cached at domain level)
-        spf_is_o365 = False
+    async def _hedged_checkers(self, email: str, domain: str, mx_records: list,
+                               deadline: Deadline) -> Tuple[Optional[Dict], Optional[asyncio.Task]]:
+        """
+        Phase 3 with a hedge: when the provider checks are still pending after their p90
+        latency, start the SMTP probe too and take the first definitive answer, cancelling
+        the other. Returns (checker result, or None when SMTP won; the SMTP probe task, if
+        started and not cancelled, for Phase 4 to reuse).
+        """
+        mx_host = mx_records[0] if mx_records else None
+        checker_task = asyncio.ensure_future(self._run_checkers(email, domain, mx_records))
+        smtp_task = None
+        try:
+            hedge_after = checker_registry.hedge_delay(self._checker_context(email, domain, mx_records))
+            if hedge_after is not None and mx_host:
+                await asyncio.wait({checker_task}, timeout=min(hedge_after, deadline.remaining()))
+            if checker_task.done() or hedge_after is None or not mx_host \
+                    or not await deadline.run(smtp_dispatcher.is_available()):
+                return await deadline.run(checker_task), None
+            
+            smtp_task = asyncio.ensure_future(self._verify_smtp(email, mx_host, deadline.timeout(PROBE_TIMEOUT)))
+            pending = {checker_task, smtp_task}
+            while checker_task in pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=deadline.remaining(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded()
+                if smtp_task in done and checker_task not in done:
+                    smtp_valid, smtp_msg = smtp_task.result()
+                    if smtp_valid or smtp_msg in SMTP_DEFINITIVE_FAILURES:
+                        checker_task.cancel()
+                        return None, smtp_task
+            
+            specialized = checker_task.result()
+            if specialized and specialized.get('valid') is not None:
+                smtp_task.cancel()
+                return specialized, None
+            return specialized, smtp_task
+        except BaseException:
+            for task in (checker_task, smtp_task):
+                if task is not None:
+                    task.cancel()
+            raise
+    
+    def _checker_context(self, email: str, domain: str, mx_records: list) -> Dict:
+        return {
+            'email': email,
+            'domain': domain,
+            'mx_records': mx_records,
+            'spf_is_o365': self._spf_is_o365_cached(domain)  # cached at domain level
+        }
+    
+    async def _run_checkers(self, email: str, domain: str, mx_records: list) -> Optional[Dict]:
+        """Run the registered provider-specific checks (cheapest first) until one is definitive"""
+        return await checker_registry.run(self._checker_context(email, domain, mx_records))
+    
+    def _spf_is_o365_cached(self, domain: str) -> bool:
+        """Whether the domain's SPF record includes Office 365 (cached)"""
         cached_spf = self.cache.get(domain, 'spf_o365')
         if cached_spf is not None:
-            spf_is_o365 = cached_spf
-        else:
-            try:
-                spf_records = dns.resolver.resolve(domain, 'TXT')
-                for record in spf_records:
-                    txt_value = str(record).lower()
-                    if 'spf.protection.outlook.com' in txt_value:
-                        spf_is_o365 = True
-                        break
-            except Exception:
-                pass
-            self.cache.set(domain, 'spf_o365', spf_is_o365)
-        
-        if mx_is_o365 or domain_is_o365 or spf_is_o365:
-            result = office365_checker.check_email(email)
-            return result
-        
-        gmail_indicators = ['gmail.com', 'googlemail.com']
-        mx_is_google = any('google' in mx.lower() or 'gmail' in mx.lower() for mx in mx_records)
-        domain_is_gmail = any(indicator in domain.lower() for indicator in gmail_indicators)
-        
-        if mx_is_google or domain_is_gmail:
-            result = gmail_checker.check_email(email)
-            return result
-        
-        return None
+            return cached_spf
+        spf_is_o365 = False
+        try:
+            spf_records = dns.resolver.resolve(domain, 'TXT')
+            for record in spf_records:
+                txt_value = str(record).lower()
+                if 'spf.protection.outlook.com' in txt_value:
+                    spf_is_o365 = True
+                    break
+        except Exception:
+            pass
+        self.cache.set(domain, 'spf_o365', spf_is_o365)
+        return spf_is_o365
     
-    async def _check_o365(self, email: str, domain: str) -> bool:
+    async def _check_o365(self, email: str, domain: str, timeout: float = O365_TIMEOUT) -> bool:
         """Check if email is on Office 365 using autodiscover API"""
         try:
             if domain in self.domain_cache_old:
@@ -379,7 +978,7 @@ class EmailVerificationService:
             else:
                 junk_user = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(20))
                 test_url = f'https://outlook.office365.com/autodiscover/autodiscover.json/v1.0/{junk_user}@{domain}?Protocol=rest'
-                r = requests.get(test_url, headers=self.headers, verify=True, allow_redirects=False, timeout=3)
+                r = await http_client.get(test_url, headers=self.headers, timeout=timeout)
                 
                 if 'outlook.office365.com' in r.text:
                     self.domain_cache_old[domain] = True
@@ -388,7 +987,7 @@ class EmailVerificationService:
                     return False
             
             url = f'https://outlook.office365.com/autodiscover/autodiscover.json/v1.0/{email}?Protocol=rest'
-            r = requests.get(url, headers=self.headers, verify=True, allow_redirects=False, timeout=3)
+            r = await http_client.get(url, headers=self.headers, timeout=timeout)
             
             if r.status_code == 200:
                 return True
@@ -400,93 +999,66 @@ class EmailVerificationService:
         except Exception:
             return False
     
-    async def _verify_smtp(self, email: str, mx_host: Optional[str]) -> Tuple[bool, str]:
-        """Verify email via SMTP handshake (reduced timeout)"""
+    async def _verify_smtp(self, email: str, mx_host: Optional[str],
+                           timeout: float = PROBE_TIMEOUT) -> Tuple[bool, str]:
+        """Verify email via SMTP handshake (MAIL FROM + RCPT TO, pipelined when supported)"""
         if not mx_host:
             return False, "no_mx"
         
         try:
-            smtp = aiosmtplib.SMTP(hostname=mx_host, port=25, timeout=5)  # Reduced from 10s
-            await smtp.connect()
-            await smtp.ehlo()
-            
-            code, message = await smtp.rcpt(email)
-            await smtp.quit()
-            
-            message_str = message.decode() if isinstance(message, bytes) else str(message)
-            message_lower = message_str.lower()
-            
-            if code == 250:
-                return True, "responsive"
-            elif code == 550:
-                if 'mailbox full' in message_lower or 'quota' in message_lower or 'over quota' in message_lower:
-                    return False, "mailbox_full"
-                elif 'does not exist' in message_lower or 'user unknown' in message_lower or 'no such user' in message_lower:
-                    return False, "user_not_found"
-                elif 'disabled' in message_lower or 'suspended' in message_lower:
-                    return False, "account_disabled"
-                else:
-                    return False, "rejected"
-            elif code == 552:
-                return False, "mailbox_full"
-            elif code == 553:
-                return False, "invalid_mailbox"
-            elif code == 450 or code == 451:
-                return False, "temporary_failure"
-            else:
-                return False, f"code_{code}"
-                
+            replies = await smtp_dispatcher.probe(mx_host, [email], timeout)
+            return self._interpret_smtp_reply((replies or {}).get(email), mx_host)
         except Exception as e:
             return False, "unreachable"
     
-    async def _check_catch_all(self, domain: str, mx_host: Optional[str]) -> bool:
+    def _interpret_smtp_reply(self, reply: Optional[Dict], mx_host: str) -> Tuple[bool, str]:
+        """Turn one probe reply ({'code', 'message', 'stage'}) into (valid, smtp status)"""
+        if not reply:
+            return False, "unreachable"
+        
+        reason = classify_reply(reply['code'], reply['message'], mx_host)
+        
+        if reply['stage'] != 'rcpt':
+            # Envelope refused before we could ask about the mailbox
+            return False, "policy_blocked" if reason == SmtpReason.POLICY_BLOCKED else "unreachable"
+        
+        if reason == SmtpReason.VALID:
+            return True, "responsive"
+        elif reason == SmtpReason.UNKNOWN:
+            return False, f"code_{reply['code']}"
+        return False, reason.value
+    
+    async def _check_catch_all(self, domain: str, mx_host: Optional[str],
+                               timeout: float = PROBE_TIMEOUT) -> bool:
         """Check if domain is catch-all by testing random email"""
         if not mx_host:
             return False
         
         try:
             random_email = f"{''.join(random.choices(string.ascii_lowercase, k=20))}@{domain}"
-            smtp = aiosmtplib.SMTP(hostname=mx_host, port=25, timeout=5)  # Reduced from 10s
-            await smtp.connect()
-            await smtp.ehlo()
+            replies = await smtp_dispatcher.probe(mx_host, [random_email], timeout)
+            if not replies:
+                return False
             
-            code, _ = await smtp.rcpt(random_email)
-            await smtp.quit()
-            
-            return code == 250
+            reply = replies[random_email]
+            return reply['stage'] == 'rcpt' and classify_reply(reply['code'], reply['message'], mx_host) == SmtpReason.VALID
         except Exception:
             return False
     
     def _is_disposable(self, domain: str) -> bool:
-        """Check if domain is a known disposable email provider"""
-        return domain.lower() in self.disposable_domains
+        """Check if domain (or a parent domain) is a known disposable email provider"""
+        return self.disposable_index.contains(domain)
     
     def _is_role_based(self, local_part: str) -> bool:
-        """Check if email is role-based"""
-        return local_part.lower() in self.ROLE_BASED_PREFIXES
+        """Check if email is role-based (sales-team@, info+eu@, support.uk@, ...)"""
+        return role_detector.is_role(local_part)
     
     def _extract_smtp_provider(self, mx_record: str) -> str:
         """Extract SMTP provider name from MX record"""
-        mx_lower = mx_record.lower()
-        
-        if 'google' in mx_lower or 'gmail' in mx_lower:
-            return 'Google Workspace'
-        elif 'outlook' in mx_lower or 'microsoft' in mx_lower:
-            return 'Microsoft 365'
-        elif 'yahoo' in mx_lower:
-            return 'Yahoo'
-        elif 'protonmail' in mx_lower or 'proton' in mx_lower:
-            return 'ProtonMail'
-        elif 'zoho' in mx_lower:
-            return 'Zoho Mail'
-        elif 'titan' in mx_lower:
-            return 'Titan'
-        elif 'mailgun' in mx_lower:
-            return 'Mailgun'
-        elif 'sendgrid' in mx_lower:
-            return 'SendGrid'
-        else:
-            return mx_record.split('.')[0] if '.' in mx_record else mx_record
+        provider = provider_index.mx_provider(mx_record)
+        if provider:
+            return provider_index.name(provider)
+        return mx_record.split('.')[0] if '.' in mx_record else mx_record
     
     def _calculate_final_status(self, result: Dict) -> Tuple[str, int, str]:
         """Calculate final status, safety score, and reason"""
@@ -522,13 +1094,14 @@ class EmailVerificationService:
         if smtp_status == 'rejected':
             return 'invalid', 20, 'Email rejected by server'
         
-        if smtp_status == 'temporary_failure':
+        if smtp_status in ('temporary_failure', 'greylisted', 'rate_limited'):
             return 'temporary_failure', 60, 'Temporary server issue - try again later'
         
-        if smtp_status == 'unreachable' and result['catch_all']:
+        # A policy block means the server refused to answer for this mailbox
+        if smtp_status in ('unreachable', 'policy_blocked') and result['catch_all']:
             return 'risky', 50, 'ACCEPT ALL'
         
-        if smtp_status == 'unreachable':
+        if smtp_status in ('unreachable', 'policy_blocked'):
             score -= 30
         
         if result['catch_all']:
@@ -553,7 +1126,7 @@ class EmailVerificationService:
     
     def _assess_spam_risk(self, result: Dict) -> str:
         """Assess spam risk level"""
-        if result['disposable']:
+        if result['disposable'] or result.get('spam_trap'):
             return 'high'
         
         if result['safety_score'] >= 80:
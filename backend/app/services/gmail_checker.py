@@ -4,13 +4,16 @@ Uses Google Calendar API to validate Gmail and GSuite email addresses
 Enhanced with catch-all detection
 """
 
-import requests
 import random
 import string
 from typing import Dict
 
+import httpx
+
+from app.services.http_client import http_client
+
 class GmailChecker:
-    def check_email(self, email: str) -> Dict:
+    async def check_email(self, email: str) -> Dict:
         """
         Check if a Gmail/GSuite email address is valid using calendar URL
         Returns: {'valid': bool, 'method': str, 'details': str, 'catch_all': bool}
@@ -18,7 +21,7 @@ class GmailChecker:
         try:
             # Check the actual email
             url = f"https://calendar.google.com/calendar/ical/{email}/public/basic.ics"
-            response = requests.head(url, timeout=10)
+            response = await http_client.head(url, timeout=10)
             
             x_frame_options = response.headers.get('X-Frame-Options', '').upper()
             
@@ -32,7 +35,7 @@ class GmailChecker:
                 }
             
             # Email appears valid, now check for catch-all
-            is_catch_all = self._check_catch_all(email)
+            is_catch_all = await self._check_catch_all(email)
             
             if x_frame_options == 'SAMEORIGIN':
                 return {
@@ -49,7 +52,7 @@ class GmailChecker:
                     'catch_all': is_catch_all
                 }
                 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return {
                 'valid': None,
                 'method': 'gmail_calendar',
@@ -57,7 +60,7 @@ class GmailChecker:
                 'catch_all': False
             }
     
-    def _check_catch_all(self, email: str) -> bool:
+    async def _check_catch_all(self, email: str) -> bool:
         """
         Check if domain is catch-all by testing a random email
         """
@@ -71,7 +74,7 @@ class GmailChecker:
             
             # Check if random email also validates
             url = f"https://calendar.google.com/calendar/ical/{random_email}/public/basic.ics"
-            response = requests.head(url, timeout=5)
+            response = await http_client.head(url, timeout=5)
             
             x_frame_options = response.headers.get('X-Frame-Options', '').upper()
             
@@ -0,0 +1,108 @@
+"""
+Shared Async HTTP Client
+One pooled httpx.AsyncClient for the specialized checkers (Office 365, Gmail, Gravatar):
+keep-alive connections, HTTP/2 when the `h2` package is installed, and a per-host
+concurrency limit so a large batch cannot flood a single provider.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx negotiates HTTP/2 only when h2 is importable)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '20'))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+HTTP_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', '10'))
+HTTP_DEFAULT_TIMEOUT = 10
+
+# Hosts that tolerate (or need) a different number of in-flight requests
+HTTP_HOST_LIMITS = {
+    'login.microsoftonline.com': 4,   # GetCredentialType throttles aggressively
+    'outlook.office365.com': 20,
+    'calendar.google.com': 20,
+    'www.gravatar.com': 20,
+}
+
+
+class AsyncHttpClient:
+    """Pooled async HTTP client with per-host limits, bound to the running event loop"""
+
+    def __init__(self, max_per_host: int = HTTP_MAX_PER_HOST, http2: bool = HTTP2_AVAILABLE):
+        self.max_per_host = max_per_host
+        self.http2 = http2
+        self._loop = None
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}  # one per proxy (None = direct)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _bind(self):
+        """Celery tasks run each job on a fresh loop; clients can't cross loops"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._clients = {}
+            self._host_limits = {}
+            self._loop = loop
+
+    def _client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        self._bind()
+        client = self._clients.get(proxy)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                proxy=proxy,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=HTTP_DEFAULT_TIMEOUT
+            )
+            self._clients[proxy] = client
+        return client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        self._bind()
+        host = urlsplit(url).hostname or ''
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(HTTP_HOST_LIMITS.get(host, self.max_per_host))
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    async def request(self, method: str, url: str, proxy: Optional[str] = None, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool (redirects are not followed unless asked)"""
+        async with self._host_limit(url):
+            return await self._client(proxy).request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def aclose(self):
+        """Close every pooled connection (call before the event loop goes away)"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"HTTP client close failed: {e}")
+
+
+# Singleton instance
+http_client = AsyncHttpClient()
@@ -3,12 +3,14 @@ Office 365 Email Checker Service
 Uses the autodiscover API to validate Office 365 email addresses
 """
 
-import requests
+import asyncio
 import random
 import string
 import uuid
 from typing import Dict
 
+from app.services.http_client import http_client
+
 class Office365Checker:
     def __init__(self):
         self.user_agent = 'Microsoft Office/16.0 (Windows NT 10.0; Microsoft Outlook 16.0.12026; Pro)'
@@ -16,7 +18,7 @@ class Office365Checker:
         # Cache stores: domain -> {'is_o365': bool, 'is_catch_all': bool}
         self.domain_cache = {}
         
-    def check_teams_status(self, email: str) -> Dict:
+    async def check_teams_status(self, email: str) -> Dict:
         """
         Check if the user exists via Lync/Teams Autodiscover.
         This is useful for Catch-All domains where standard Autodiscover returns 200 for everyone.
@@ -28,7 +30,7 @@ class Office365Checker:
             # Use short timeout as many domains won't have this
             base_url = f"https://lyncdiscover.{domain}/"
             try:
-                r_base = requests.get(base_url, timeout=3)
+                r_base = await http_client.get(base_url, timeout=3, follow_redirects=True)
                 if r_base.status_code not in [200, 401, 403]:
                     return {'detected': False, 'details': 'No Lync/Teams service'}
             except:
@@ -42,7 +44,7 @@ class Office365Checker:
             # Note: We expect 401 Unauthorized for valid users usually (since we don't have creds),
             # but sometimes 404 or 500 for invalid ones depending on config.
             # This is not 100% reliable without credentials but works on some federated setups.
-            r = requests.get(url, headers=self.headers, verify=True, timeout=5)
+            r = await http_client.get(url, headers=self.headers, timeout=5, follow_redirects=True)
             
             # If we get a distinct error code or XML content, it might offer a clue.
             # But mostly, the *existence* of the service + Catch-All O365 suggests we should rely on Social checks more.
@@ -57,7 +59,7 @@ class Office365Checker:
         except Exception as e:
             return {'detected': False, 'details': str(e)}
     
-    def check_user_via_login_api(self, email: str, max_retries: int = 3, proxy: str = None) -> Dict:
+    async def check_user_via_login_api(self, email: str, max_retries: int = 3, proxy: str = None) -> Dict:
         """
         Check if user exists using Microsoft Login API (GetCredentialType endpoint).
         This is the most reliable method as it bypasses catch-all configurations.
@@ -67,12 +69,6 @@ class Office365Checker:
         Returns:
             Dict with 'exists' (bool), 'method' (str), 'details' (str)
         """
-        import time as _time
-        
-        proxies = {}
-        if proxy:
-            proxies = {"http": proxy, "https": proxy}
-        
         for attempt in range(max_retries + 1):
             try:
                 url = "https://login.microsoftonline.com/common/GetCredentialType?mkt=en-US"
@@ -108,13 +104,13 @@ class Office365Checker:
                     'Origin': 'https://login.microsoftonline.com'
                 }
                 
-                response = requests.post(url, json=payload, headers=headers, timeout=15, proxies=proxies)
+                response = await http_client.post(url, json=payload, headers=headers, timeout=15, proxy=proxy)
                 
                 # Handle HTTP-level throttling (429)
                 if response.status_code == 429:
                     if attempt < max_retries:
                         wait = 3 * (2 ** attempt)  # 3s, 6s, 12s
-                        _time.sleep(wait)
+                        await asyncio.sleep(wait)
                         continue
                     return {
                         'exists': None,
@@ -131,7 +127,7 @@ class Office365Checker:
                     if throttle_status == 1:
                         if attempt < max_retries:
                             wait = 3 * (2 ** attempt)  # 3s, 6s, 12s
-                            _time.sleep(wait)
+                            await asyncio.sleep(wait)
                             continue
                         return {
                             'exists': None,
@@ -186,7 +182,7 @@ class Office365Checker:
                     
             except Exception as e:
                 if attempt < max_retries:
-                    _time.sleep(2)
+                    await asyncio.sleep(2)
                     continue
                 return {
                     'exists': None,
@@ -201,7 +197,7 @@ class Office365Checker:
         # ... logic to be integrated below ...
         return {}
     
-    def get_domain_info(self, domain: str) -> Dict:
+    async def get_domain_info(self, domain: str) -> Dict:
         """Check if a domain uses Office 365 and if it's catch-all"""
         if domain in self.domain_cache:
             return self.domain_cache[domain]
@@ -210,7 +206,7 @@ class Office365Checker:
             # Generate a junk user to test domain behavior
             junk_user = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(20))
             url = f'https://outlook.office365.com/autodiscover/autodiscover.json/v1.0/{junk_user}@{domain}?Protocol=rest'
-            r = requests.get(url, headers=self.headers, verify=True, allow_redirects=False, timeout=10)
+            r = await http_client.get(url, headers=self.headers, timeout=10)
             
             result = {
                 'is_o365': False,
@@ -250,11 +246,11 @@ class Office365Checker:
             print(f"Error checking O365 domain: {e}")
             return {'is_o365': False, 'is_catch_all': False}
     
-    def is_o365_domain(self, domain: str) -> bool:
+    async def is_o365_domain(self, domain: str) -> bool:
         """Legacy compatibility method"""
-        return self.get_domain_info(domain)['is_o365']
+        return (await self.get_domain_info(domain))['is_o365']
     
-    def check_email(self, email: str) -> Dict:
+    async def check_email(self, email: str) -> Dict:
         """
         Check if an Office 365 email address is valid
         Returns: {'valid': bool, 'method': str, 'details': str, 'catch_all': bool}
@@ -263,7 +259,7 @@ class Office365Checker:
             domain = email.split("@")[1]
             
             # Get domain info (checks for O365 and catch-all)
-            domain_info = self.get_domain_info(domain)
+            domain_info = await self.get_domain_info(domain)
             
             if not domain_info['is_o365']:
                 return {
@@ -273,7 +269,7 @@ class Office365Checker:
                 }
             
             # ALWAYS try Login API first for O365 domains (most reliable)
-            login_check = self.check_user_via_login_api(email)
+            login_check = await self.check_user_via_login_api(email)
             
             if login_check['exists'] is True:
                 # User definitively exists
@@ -297,7 +293,7 @@ class Office365Checker:
             
             # If domain is catch-all and Login API failed, try Teams
             if domain_info['is_catch_all']:
-                teams_status = self.check_teams_status(email)
+                teams_status = await self.check_teams_status(email)
                 
                 if teams_status['detected']:
                     return {
@@ -318,7 +314,7 @@ class Office365Checker:
             
             # Check the specific email
             url = f'https://outlook.office365.com/autodiscover/autodiscover.json/v1.0/{email}?Protocol=rest'
-            r = requests.get(url, headers=self.headers, verify=True, allow_redirects=False, timeout=10)
+            r = await http_client.get(url, headers=self.headers, timeout=10)
             
             if r.status_code == 200:
                 return {
@@ -0,0 +1,166 @@
+"""
+Mail Provider Index
+One table of mailbox providers, compiled into reversed-label suffix tries over MX
+hostnames and mailbox domains. The verifier (smtp_provider), the domain sorter, the
+checker registry and the SMTP reply classifier all classify through it, so they agree,
+and each MX host is classified once (memoised) in O(labels).
+
+Suffixes match on whole labels: "aspmx.l.google.com" matches "google.com", while
+"mx.notgoogle.com" matches nothing.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence
+
+from app.services.domain_normalizer import domain_forms
+
+# key -> display name, sorter category, SMTP reply-classifier family,
+#        MX host suffixes, mailbox domain suffixes
+PROVIDERS = {
+    'microsoft': {
+        'name': 'Microsoft 365',
+        'category': 'office365',
+        'family': 'microsoft',
+        'mx_suffixes': ['outlook.com', 'outlook.de', 'outlook.cn', 'hotmail.com',
+                        'onmicrosoft.com', 'microsoft.com', 'office365.com'],
+        'domains': ['outlook.com', 'hotmail.com', 'live.com', 'msn.com', 'office365.com',
+                    'onmicrosoft.com', 'microsoft.com'],
+    },
+    'google': {
+        'name': 'Google Workspace',
+        'category': 'gsuite',
+        'family': 'google',
+        'mx_suffixes': ['google.com', 'googlemail.com', 'gmail.com'],
+        'domains': ['gmail.com', 'googlemail.com'],
+    },
+    'yahoo': {
+        'name': 'Yahoo',
+        'category': 'yahoo',
+        'family': 'yahoo',
+        'mx_suffixes': ['yahoodns.net', 'yahoo.com', 'aol.com'],
+        'domains': [],
+    },
+    'protonmail': {
+        'name': 'ProtonMail',
+        'category': 'protonmail',
+        'family': None,
+        'mx_suffixes': ['protonmail.ch', 'protonmail.com', 'proton.me'],
+        'domains': [],
+    },
+    'zoho': {
+        'name': 'Zoho Mail',
+        'category': 'zoho',
+        'family': None,
+        'mx_suffixes': ['zoho.com', 'zoho.eu', 'zoho.in', 'zoho.com.au', 'zohomail.com'],
+        'domains': [],
+    },
+    'titan': {
+        'name': 'Titan',
+        'category': 'titan',
+        'family': None,
+        'mx_suffixes': ['titan.email', 'flock.email'],
+        'domains': [],
+    },
+    'mailgun': {
+        'name': 'Mailgun',
+        'category': 'other',  # relay service, sorted with other providers
+        'family': None,
+        'mx_suffixes': ['mailgun.org'],
+        'domains': [],
+    },
+    'sendgrid': {
+        'name': 'SendGrid',
+        'category': 'other',  # relay service, sorted with other providers
+        'family': None,
+        'mx_suffixes': ['sendgrid.net'],
+        'domains': [],
+    },
+}
+
+# Consumer brands served on every country domain (hotmail.fr, outlook.de, yahoo.com.mx)
+COUNTRY_DOMAIN_BASES = {
+    'outlook': 'microsoft', 'hotmail': 'microsoft', 'live': 'microsoft', 'msn': 'microsoft',
+    'yahoo': 'yahoo',
+}
+
+_END = ''  # trie key holding the provider of the suffix ending here
+
+
+def _build_suffix_trie(entries: Iterable) -> Dict:
+    """(suffix, provider) pairs -> nested dicts keyed by labels from the right"""
+    root: Dict = {}
+    for suffix, provider in entries:
+        node = root
+        for label in reversed(suffix.split('.')):
+            node = node.setdefault(label, {})
+        node[_END] = provider
+    return root
+
+
+def _longest_suffix_match(trie: Dict, host: str) -> Optional[str]:
+    node = trie
+    match = None
+    for label in reversed(host.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        match = node.get(_END, match)
+    return match
+
+
+class ProviderIndex:
+    """Provider classification of MX hosts and mailbox domains"""
+
+    def __init__(self, providers: Dict = PROVIDERS):
+        self.providers = providers
+        self._mx_trie = _build_suffix_trie(
+            (suffix, key) for key, p in providers.items() for suffix in p['mx_suffixes']
+        )
+        self._domain_trie = _build_suffix_trie(
+            (domain, key) for key, p in providers.items() for domain in p['domains']
+        )
+
+    @lru_cache(maxsize=16384)
+    def mx_provider(self, mx_host: Optional[str]) -> Optional[str]:
+        """Provider key for an MX hostname, or None"""
+        if not mx_host:
+            return None
+        return _longest_suffix_match(self._mx_trie, mx_host.lower().rstrip('.'))
+
+    @lru_cache(maxsize=16384)
+    def domain_provider(self, domain: str) -> Optional[str]:
+        """Provider key for a consumer mailbox domain (gmail.com, hotmail.fr, x.onmicrosoft.com), or None"""
+        forms = domain_forms(domain)
+        if forms is None:
+            return None
+        provider = _longest_suffix_match(self._domain_trie, forms.ascii)
+        if provider:
+            return provider
+        # Brand directly under a public suffix: hotmail.fr, live.co.uk (not live.example.org)
+        if forms.registrable == forms.ascii:
+            return COUNTRY_DOMAIN_BASES.get(forms.ascii.split('.', 1)[0])
+        return None
+
+    def classify(self, domain: str, mx_hosts: Sequence[str] = ()) -> Optional[str]:
+        """Provider key from the mailbox domain, else from the first recognised MX host"""
+        provider = self.domain_provider(domain) if domain else None
+        if provider:
+            return provider
+        for mx_host in mx_hosts:
+            provider = self.mx_provider(mx_host)
+            if provider:
+                return provider
+        return None
+
+    def name(self, provider: Optional[str]) -> Optional[str]:
+        return self.providers[provider]['name'] if provider else None
+
+    def category(self, provider: Optional[str]) -> Optional[str]:
+        return self.providers[provider]['category'] if provider else None
+
+    def family(self, provider: Optional[str]) -> Optional[str]:
+        return self.providers[provider]['family'] if provider else None
+
+
+# Singleton instance
+provider_index = ProviderIndex()
@@ -0,0 +1,126 @@
+"""
+Mailbox Result Cache
+Recent mailbox-level verdicts (standard / deep verifications that reached a conclusion),
+keyed by canonical address. Kept in a bounded in-process LRU with a TTL and backed by the
+verification_history table, so a process that has not verified an address itself can
+still answer from the last verdict any worker stored.
+
+Serves the cached_only verification mode, which must not touch the network.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.services.email_canonicalizer import canonicalize_email
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '100000'))
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', str(7 * 24 * 3600)))
+RESULT_CACHE_DEPTHS = ('standard', 'deep')
+# Verdicts that say nothing lasting about the mailbox
+UNCACHEABLE_STATUSES = {'unknown', 'error', 'temporary_failure'}
+HISTORY_LOOKUP_CHUNK = 500
+HISTORY_RECHECK_SECONDS = 300  # an address missing from history is not looked up again sooner
+
+
+class ResultCache:
+    """TTL + LRU cache of mailbox verdicts, with the history table as second level"""
+
+    def __init__(self, max_size: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()  # canonical email -> (verified_at epoch, result)
+        self._history_checked: Dict[str, float] = {}  # canonical email -> when history was last searched
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, result: Dict, verified_at: Optional[float] = None):
+        """Remember a finished verification, if it is a mailbox-level verdict"""
+        if result.get('depth') not in RESULT_CACHE_DEPTHS or result.get('partial') \
+                or result.get('final_status') in UNCACHEABLE_STATUSES or 'freshness' in result:
+            # 'freshness' marks an answer served from cache, not a new verification
+            return
+        key = canonicalize_email(result['email'])
+        verified_at = verified_at or time.time()
+        current = self._entries.get(key)
+        if current is not None and current[0] > verified_at:
+            return
+        self._entries[key] = (verified_at, result.copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, email: str) -> Optional[Tuple[Dict, float]]:
+        """(copy of the cached result, verified_at epoch), or None"""
+        key = canonicalize_email(email)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        verified_at, result = entry
+        if time.time() - verified_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        hit = result.copy()
+        hit['details'] = dict(hit.get('details') or {})
+        return hit, verified_at
+
+    def load_history(self, emails: Iterable[str]) -> int:
+        """Pull the latest stored verdicts for addresses not in memory. Returns how many rows were used."""
+        now = time.time()
+        pending = {}
+        for email in emails:
+            key = canonicalize_email(email)
+            if key not in self._entries and now - self._history_checked.get(key, 0) >= HISTORY_RECHECK_SECONDS:
+                local, _, domain = email.strip().rpartition('@')
+                pending.setdefault(key, set()).update((email.strip(), f"{local}@{domain.lower()}"))
+        if not pending:
+            return 0
+        if len(self._history_checked) > self.max_size:
+            self._history_checked.clear()
+        for key in pending:
+            self._history_checked[key] = now
+        # History keeps the address as it was submitted (domain lower-cased by the API):
+        # look up those spellings and the canonical one, so the email index is used
+        wanted = set(pending).union(*pending.values())
+        try:
+            return self._load_history(sorted(wanted))
+        except Exception as e:
+            logger.debug(f"Verification history unavailable: {e}")
+            return 0
+
+    async def load_history_async(self, emails: Iterable[str]) -> int:
+        return await asyncio.to_thread(self.load_history, list(emails))
+
+    def _load_history(self, emails) -> int:
+        from app.core.database import SessionLocal
+        from app.models.models import VerificationHistory
+
+        since = datetime.utcnow() - timedelta(seconds=self.ttl)
+        used = 0
+        db = SessionLocal()
+        try:
+            for i in range(0, len(emails), HISTORY_LOOKUP_CHUNK):
+                rows = db.query(VerificationHistory.result_json, VerificationHistory.created_at).filter(
+                    VerificationHistory.email.in_(emails[i:i + HISTORY_LOOKUP_CHUNK]),
+                    VerificationHistory.created_at >= since,
+                ).order_by(VerificationHistory.created_at).all()
+                # Oldest first: the latest verdict per address wins
+                for result_json, created_at in rows:
+                    if isinstance(result_json, dict) and result_json.get('email'):
+                        self.put(result_json, created_at.replace(tzinfo=timezone.utc).timestamp())
+                        used += 1
+        finally:
+            db.close()
+        return used
+
+
+# Singleton instance
+result_cache = ResultCache()
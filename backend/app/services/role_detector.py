@@ -0,0 +1,134 @@
+"""
+Role Account Detector
+Flags shared/functional mailboxes (info@, sales-team@, support.uk@, no_reply@, ...).
+
+The local part is normalised first - casefolded, "+tag" removed, accents stripped, split
+on '.', '_' and '-', digits trimmed from each token - and the compacted form is walked
+once through a precompiled trie of role words (English plus common European languages).
+An address is a role account when a role word starts the local part, ends on a token
+boundary (or inside its token, followed by a long qualifier: salesteam, supportdesk), and
+every token after it is a qualifier such as "team", "desk" or a region code (sales.uk,
+no-reply, hr). So info.eu@ matches but director.jane@, it.nguyen@ and mailin@ do not.
+Two-letter role words (hr, it, pr, ir) only count as a whole token. A lookup is
+O(len(local part)).
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+ROLE_WORDS = {
+    # English
+    'admin', 'administrator', 'info', 'information', 'support', 'sales', 'contact', 'contactus',
+    'help', 'helpdesk', 'service', 'services', 'customerservice', 'customercare', 'customersupport',
+    'noreply', 'donotreply', 'postmaster', 'hostmaster', 'webmaster', 'abuse', 'security',
+    'privacy', 'legal', 'compliance', 'marketing', 'billing', 'accounts', 'accounting',
+    'accountspayable', 'accountsreceivable', 'finance', 'invoice', 'invoices', 'payments',
+    'payroll', 'purchasing', 'procurement', 'orders', 'order', 'shop', 'store', 'bookings',
+    'booking', 'reservations', 'enquiries', 'enquiry', 'inquiries', 'inquiry', 'office',
+    'reception', 'frontdesk', 'hr', 'humanresources', 'jobs', 'careers', 'recruiting',
+    'recruitment', 'hiring', 'talent', 'press', 'media', 'pr', 'news', 'newsletter', 'events',
+    'feedback', 'hello', 'team', 'staff', 'everyone', 'all', 'mail', 'email', 'mailer',
+    'daemon', 'mailerdaemon', 'root', 'sysadmin', 'it', 'tech', 'techsupport', 'devops',
+    'ops', 'operations', 'partners', 'partnerships', 'affiliates', 'investors', 'ir',
+    'management', 'manager', 'director', 'ceo', 'board', 'general', 'enquire', 'notifications',
+    'alerts', 'subscribe', 'unsubscribe', 'list', 'listserv', 'spam', 'registrar', 'domains',
+    'ftp', 'www', 'usenet', 'uucp', 'noc', 'welcome', 'community', 'membership',
+    'members', 'donations', 'volunteer', 'volunteers', 'sponsorship', 'editor', 'editorial',
+    # German
+    'kontakt', 'vertrieb', 'verkauf', 'buchhaltung', 'verwaltung', 'empfang', 'bewerbung',
+    'bewerbungen', 'presse', 'datenschutz', 'impressum', 'kundenservice', 'kundendienst',
+    'anfrage', 'anfragen', 'bestellung', 'bestellungen', 'rechnung', 'rechnungen', 'personal',
+    'zentrale', 'sekretariat', 'einkauf', 'technik',
+    # French
+    'commercial', 'ventes', 'vente', 'compta', 'comptabilite', 'accueil', 'direction',
+    'recrutement', 'emploi', 'facturation', 'assistance', 'serviceclient', 'secretariat',
+    'reservation', 'commande', 'commandes', 'renseignements',
+    # Spanish / Portuguese / Italian
+    'ventas', 'contacto', 'contato', 'soporte', 'suporte', 'ayuda', 'facturacion',
+    'administracion', 'administracao', 'informacion', 'informacoes', 'atencion',
+    'atendimento', 'empleo', 'rrhh', 'rh', 'recepcion', 'recepcao', 'pedidos', 'reservas',
+    'vendas', 'financeiro', 'faturamento', 'compras', 'vendite', 'assistenza',
+    'amministrazione', 'commerciale', 'ufficio', 'segreteria', 'ordini', 'prenotazioni',
+    'lavoro', 'contatti', 'informazioni',
+    # Dutch / Nordic
+    'verkoop', 'klantenservice', 'administratie', 'boekhouding', 'inkoop', 'receptie',
+    'kundeservice', 'kundservice', 'salg', 'forsaljning', 'kontor',
+}
+
+# Tokens that may follow a role word (sales.team, support.uk, info-de)
+ROLE_QUALIFIERS = {
+    'team', 'dept', 'department', 'desk', 'group', 'office', 'center', 'centre', 'line',
+    'inbox', 'mail', 'hq', 'global', 'intl', 'us', 'usa', 'uk', 'eu', 'emea', 'apac',
+    'latam', 'asia', 'na', 'au', 'ca', 'de', 'fr', 'es', 'it', 'nl', 'in', 'jp',
+}
+
+# Qualifiers long enough to be written glued to the role word (salesteam, infomail)
+COMPOUND_QUALIFIERS = {q for q in ROLE_QUALIFIERS if len(q) >= 4}
+
+_SEPARATORS_RE = re.compile(r'[._\-]+')
+_DIGITS = '0123456789'
+_END = ''  # trie key marking the end of a word
+
+
+def _build_trie(words: Iterable[str]) -> Dict:
+    root: Dict = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_END] = True
+    return root
+
+
+_ROLE_TRIE = _build_trie(ROLE_WORDS)
+
+
+def _strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+class RoleDetector:
+    """Normalising role-account matcher over a precompiled trie"""
+
+    def _tokens(self, local_part: str) -> List[str]:
+        local = _strip_accents(local_part.casefold().split('+', 1)[0])
+        tokens = (token.strip(_DIGITS) for token in _SEPARATORS_RE.split(local))
+        return [token for token in tokens if token]
+
+    @lru_cache(maxsize=65536)
+    def is_role(self, local_part: str) -> bool:
+        """Whether the local part names a role / shared mailbox"""
+        tokens = self._tokens(local_part)
+        if not tokens:
+            return False
+
+        compact = ''.join(tokens)
+        ends = []  # end position of each token in compact
+        position = 0
+        for token in tokens:
+            position += len(token)
+            ends.append(position)
+
+        node = _ROLE_TRIE
+        for i, ch in enumerate(compact, 1):
+            node = node.get(ch)
+            if node is None:
+                return False
+            if _END not in node or (i <= 2 and i != ends[0]):
+                continue
+            # Token the role word ends in; it must end there or go on with a long qualifier
+            index = bisect_right(ends, i - 1)
+            if ends[index] != i and compact[i:ends[index]] not in COMPOUND_QUALIFIERS:
+                continue
+            if all(token in ROLE_QUALIFIERS for token in tokens[index + 1:]):
+                return True
+        return False
+
+
+# Singleton instance
+role_detector = RoleDetector()
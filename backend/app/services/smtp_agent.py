@@ -0,0 +1,215 @@
+"""
+Remote SMTP Probe Agents
+Moves the SMTP phase off the API / Celery workers onto dedicated hosts with clean port-25 egress.
+
+- Agents (`python -m app.services.smtp_agent`) pull probe requests (MX host + recipients)
+  from a Redis list, run them with the local SmtpProber and push structured results back.
+- SmtpProbeDispatcher is what the verifier calls: it hands probes to live agents, or runs
+  them in-process when no agent is available (single-node setups).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from app.services.smtp_egress import smtp_egress
+from app.services.smtp_prober import smtp_prober, PROBE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# local = always in-process, remote = always via agents, auto = agents when any are alive
+PROBE_MODE = os.getenv('SMTP_PROBE_MODE', 'auto').lower()
+
+REQUEST_QUEUE = 'smtp_probe:requests'
+REPLY_PREFIX = 'smtp_probe:reply:'
+AGENT_PREFIX = 'smtp_probe:agents:'
+AGENT_HEARTBEAT_SECONDS = 5
+AGENT_TTL_SECONDS = 15
+AGENT_LOOKUP_TTL = 5  # how long the dispatcher trusts its view of live agents
+REPLY_TTL_SECONDS = 60
+
+
+class SmtpProbeDispatcher:
+    """Routes SMTP probes to remote agents or the in-process prober"""
+
+    def __init__(self, mode: str = PROBE_MODE, redis_url: str = REDIS_URL):
+        self.mode = mode
+        self.redis_url = redis_url
+        self._redis = None
+        self._redis_loop = None
+        self._agents_alive = False
+        self._agents_checked_at = 0.0
+
+    def _client(self):
+        """redis.asyncio client bound to the running loop (Celery tasks create fresh loops)"""
+        import redis.asyncio as aioredis
+
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True, socket_connect_timeout=2)
+            self._redis_loop = loop
+        return self._redis
+
+    async def agents_available(self) -> bool:
+        """Whether at least one agent has sent a heartbeat recently"""
+        if self.mode == 'local':
+            return False
+        if time.time() - self._agents_checked_at < AGENT_LOOKUP_TTL:
+            return self._agents_alive
+        try:
+            client = self._client()
+            alive = False
+            async for _ in client.scan_iter(match=f'{AGENT_PREFIX}*', count=100):
+                alive = True
+                break
+        except Exception as e:
+            logger.debug(f"SMTP agent lookup failed: {e}")
+            alive = False
+        self._agents_alive = alive
+        self._agents_checked_at = time.time()
+        return alive
+
+    async def is_available(self) -> bool:
+        """Whether SMTP probes can run anywhere (remote agents or local egress)"""
+        if await self.agents_available():
+            return True
+        if self.mode == 'remote':
+            return False
+        return await smtp_egress.is_available()
+
+    async def probe(self, mx_host: str, recipients: List[str],
+                    timeout: float = PROBE_TIMEOUT) -> Optional[Dict[str, dict]]:
+        """Same contract as SmtpProber.probe: {recipient: {'code', 'message', 'stage'}} or None"""
+        if await self.agents_available():
+            return await self._probe_remote(mx_host, recipients, timeout)
+        if self.mode == 'remote':
+            return None
+        return await smtp_prober.probe(mx_host, recipients, timeout)
+
+    async def _probe_remote(self, mx_host: str, recipients: List[str],
+                            timeout: float) -> Optional[Dict[str, dict]]:
+        request_id = uuid.uuid4().hex
+        reply_key = f'{REPLY_PREFIX}{request_id}'
+        request = {
+            'id': request_id,
+            'mx_host': mx_host,
+            'recipients': recipients,
+            'timeout': timeout,
+            'reply_to': reply_key,
+            'enqueued_at': time.time()
+        }
+        # Allow for queueing plus one STARTTLS retry on the agent side
+        wait = max(1, int(timeout * 3))
+        try:
+            client = self._client()
+            await client.rpush(REQUEST_QUEUE, json.dumps(request))
+            reply = await client.blpop(reply_key, timeout=wait)
+        except Exception as e:
+            logger.warning(f"Remote SMTP probe for {mx_host} failed: {e}")
+            return None
+        if not reply:
+            logger.warning(f"Remote SMTP probe for {mx_host} timed out after {wait}s")
+            return None
+        return json.loads(reply[1]).get('results')
+
+
+async def _heartbeat(client, agent_id: str):
+    while True:
+        try:
+            available = await smtp_egress.is_available()
+            if available:
+                await client.set(f'{AGENT_PREFIX}{agent_id}', json.dumps({
+                    'host': socket.gethostname(),
+                    'pid': os.getpid(),
+                    'ts': time.time()
+                }), ex=AGENT_TTL_SECONDS)
+            else:
+                # No egress here: stop advertising so dispatchers stop sending work
+                await client.delete(f'{AGENT_PREFIX}{agent_id}')
+        except Exception as e:
+            logger.warning(f"SMTP agent heartbeat failed: {e}")
+        await asyncio.sleep(AGENT_HEARTBEAT_SECONDS)
+
+
+async def _handle(client, raw: str):
+    try:
+        request = json.loads(raw)
+        reply_key = request['reply_to']
+    except (ValueError, TypeError, KeyError) as e:
+        # Nowhere to answer: the dispatcher, if any, times out on its own
+        logger.error(f"Malformed SMTP probe request dropped: {e}")
+        return
+    # Stale requests: the dispatcher has already given up waiting
+    age = time.time() - request.get('enqueued_at', time.time())
+    if age > request.get('timeout', PROBE_TIMEOUT) * 3:
+        return
+    try:
+        results = await smtp_prober.probe(
+            request['mx_host'], request['recipients'], request.get('timeout', PROBE_TIMEOUT)
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Answer anyway so the dispatcher falls back now instead of waiting out its timeout
+        logger.error(f"SMTP probe for request {request.get('id')} failed: {e}")
+        results = None
+    await client.rpush(reply_key, json.dumps({'id': request.get('id'), 'results': results}))
+    await client.expire(reply_key, REPLY_TTL_SECONDS)
+
+
+async def _worker(client, worker_id: int):
+    while True:
+        try:
+            item = await client.blpop(REQUEST_QUEUE, timeout=AGENT_HEARTBEAT_SECONDS)
+            if item:
+                await _handle(client, item[1])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"SMTP agent worker {worker_id} error: {e}")
+            await asyncio.sleep(1)
+
+
+async def run_agent(concurrency: int = 20, redis_url: str = REDIS_URL):
+    """Run a probe agent: heartbeat plus `concurrency` queue consumers"""
+    import redis.asyncio as aioredis
+
+    agent_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    client = aioredis.from_url(redis_url, decode_responses=True)
+
+    # Detect egress before advertising ourselves
+    if not await smtp_egress.check():
+        logger.warning("SMTP agent started without port-25 egress; waiting for it to become available")
+
+    logger.info(f"SMTP probe agent {agent_id} running with concurrency {concurrency}")
+    tasks = [asyncio.create_task(_heartbeat(client, agent_id))]
+    tasks += [asyncio.create_task(_worker(client, i)) for i in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await client.delete(f'{AGENT_PREFIX}{agent_id}')
+        await client.aclose()
+
+
+# Singleton instance
+smtp_dispatcher = SmtpProbeDispatcher()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a remote SMTP probe agent")
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('SMTP_AGENT_CONCURRENCY', '20')))
+    parser.add_argument('--redis-url', default=REDIS_URL)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_agent(concurrency=args.concurrency, redis_url=args.redis_url))
@@ -0,0 +1,97 @@
+"""
+SMTP Egress Detection Service
+Detects whether this host can open outbound connections on port 25.
+Many cloud VMs block port 25; on those hosts SMTP probes are skipped entirely
+instead of burning their full timeout on every verification.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# auto = detect at startup and periodically; on / off = force
+EGRESS_MODE = os.getenv('SMTP_EGRESS_MODE', 'auto').lower()
+EGRESS_CHECK_INTERVAL = float(os.getenv('SMTP_EGRESS_CHECK_INTERVAL', '600'))
+EGRESS_PROBE_TIMEOUT = float(os.getenv('SMTP_EGRESS_PROBE_TIMEOUT', '3'))
+EGRESS_PROBE_HOSTS = [
+    h.strip() for h in os.getenv(
+        'SMTP_EGRESS_PROBE_HOSTS',
+        'gmail-smtp-in.l.google.com,mta5.am0.yahoodns.net,outlook-com.olc.protection.outlook.com'
+    ).split(',') if h.strip()
+]
+
+
+class SmtpEgressMonitor:
+    """
+    Tracks whether outbound SMTP (port 25) works from this host.
+    The result is refreshed lazily once it is older than EGRESS_CHECK_INTERVAL.
+    """
+
+    def __init__(self, mode: str = EGRESS_MODE, interval: float = EGRESS_CHECK_INTERVAL):
+        self.mode = mode
+        self.interval = interval
+        self._available: Optional[bool] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def _probe_host(self, host: str) -> bool:
+        """Open a TCP connection to host:25 and wait for a 220 banner"""
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, 25), timeout=EGRESS_PROBE_TIMEOUT
+            )
+            banner = await asyncio.wait_for(reader.readline(), timeout=EGRESS_PROBE_TIMEOUT)
+            return banner.startswith(b'220')
+        except Exception:
+            return False
+        finally:
+            if writer is not None:
+                writer.close()
+
+    async def check(self) -> bool:
+        """Probe the reference MX hosts now; egress works if any of them answers"""
+        results = await asyncio.gather(*(self._probe_host(h) for h in EGRESS_PROBE_HOSTS))
+        available = any(results)
+        if available != self._available:
+            logger.warning(f"SMTP egress {'available' if available else 'BLOCKED'} (port 25)")
+        self._available = available
+        self._checked_at = time.time()
+        return available
+
+    def is_stale(self) -> bool:
+        return self._available is None or (time.time() - self._checked_at) >= self.interval
+
+    async def is_available(self) -> bool:
+        """Whether SMTP probes should run; re-detects when the last result is stale"""
+        if self.mode == 'on':
+            return True
+        if self.mode == 'off':
+            return False
+        if not self.is_stale():
+            return self._available
+
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight.done() or self._inflight.get_loop() is not loop:
+            self._inflight = loop.create_task(self.check())
+        if self._available is not None:
+            # Keep serving the previous answer while the refresh runs
+            return self._available
+        # Shielded: a caller's deadline must not cancel the shared detection
+        return await asyncio.shield(self._inflight)
+
+    def status(self) -> dict:
+        """Current state, for health checks"""
+        return {
+            'mode': self.mode,
+            'available': self._available,
+            'checked_at': self._checked_at or None
+        }
+
+
+# Singleton instance
+smtp_egress = SmtpEgressMonitor()
@@ -0,0 +1,457 @@
+"""
+SMTP Probe Service
+Lightweight SMTP sessions for mailbox probing (banner, EHLO, MAIL FROM, RCPT TO)
+with a per-MX-host capability cache, so repeat connections skip pointless round trips,
+pipeline the envelope when the server allows it and size recipient batches correctly
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import ssl
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.services.circuit_breaker import smtp_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+SMTP_PORT = 25
+PROBE_TIMEOUT = float(os.getenv('SMTP_PROBE_TIMEOUT', '5'))
+CAPABILITY_TTL = float(os.getenv('SMTP_CAPABILITY_TTL', '21600'))  # 6 hours
+IP_CACHE_TTL = 3600
+MAIL_FROM = os.getenv('SMTP_PROBE_MAIL_FROM', '')  # empty = null reverse-path <>
+HELO_HOSTNAME = os.getenv('SMTP_HELO_HOSTNAME') or socket.getfqdn()
+
+# RFC 5321 4.5.3.1.8: servers must accept at least 100 recipients per transaction
+DEFAULT_MAX_RECIPIENTS = 100
+
+# Pre-warmed sessions (bulk look-ahead): total cap, per-host cap, idle lifetime
+WARM_MAX_SESSIONS = int(os.getenv('SMTP_WARM_MAX_SESSIONS', '20'))
+WARM_MAX_PER_HOST = int(os.getenv('SMTP_WARM_MAX_PER_HOST', '2'))
+WARM_IDLE_SECONDS = float(os.getenv('SMTP_WARM_IDLE_SECONDS', '15'))
+
+
+class SmtpProbeError(Exception):
+    """Session-level failure: connection dropped, malformed reply or bad handshake"""
+
+
+class SmtpStartTlsRequired(SmtpProbeError):
+    """Server refused the envelope until STARTTLS is issued"""
+
+
+class SmtpCapabilityCache:
+    """
+    TTL cache of what each MX host supports:
+    banner, ESMTP/EHLO extensions, PIPELINING, STARTTLS (offered / required),
+    SIZE and the largest recipient batch the server accepted
+    """
+
+    def __init__(self, ttl_seconds: float = CAPABILITY_TTL):
+        self._cache: Dict[str, dict] = {}
+        self._ttl = ttl_seconds
+
+    def get(self, mx_host: str) -> Optional[dict]:
+        entry = self._cache.get(mx_host)
+        if entry and (time.time() - entry['ts']) < self._ttl:
+            return entry['value']
+        return None
+
+    def set(self, mx_host: str, capabilities: dict):
+        self._cache[mx_host] = {'value': capabilities, 'ts': time.time()}
+
+    def update(self, mx_host: str, **changes):
+        """Record something learned mid-session (e.g. STARTTLS required, recipient limit)"""
+        capabilities = dict(self.get(mx_host) or self.default())
+        capabilities.update(changes)
+        self.set(mx_host, capabilities)
+
+    @staticmethod
+    def default() -> dict:
+        return {
+            'banner': '',
+            'esmtp': True,
+            'extensions': {},
+            'pipelining': False,
+            'starttls': False,
+            'starttls_required': False,
+            'size': None,
+            'max_recipients': DEFAULT_MAX_RECIPIENTS
+        }
+
+
+def parse_ehlo_extensions(message: str) -> Dict[str, str]:
+    """Parse an EHLO reply body into {EXTENSION: params}; the first line is the greeting"""
+    extensions = {}
+    for line in message.split('\n')[1:]:
+        parts = line.strip().split(None, 1)
+        if parts:
+            extensions[parts[0].upper()] = parts[1] if len(parts) > 1 else ''
+    return extensions
+
+
+class SmtpProbeSession:
+    """One SMTP connection used to probe recipients; never sends DATA"""
+
+    def __init__(self, mx_host: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 timeout: float = PROBE_TIMEOUT):
+        self.mx_host = mx_host
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.capabilities = SmtpCapabilityCache.default()
+        self.last_used = time.time()
+        self.loop = asyncio.get_running_loop()
+
+    @classmethod
+    async def open(cls, mx_host: str, address: Optional[str] = None, timeout: float = PROBE_TIMEOUT,
+                   capabilities: Optional[dict] = None) -> 'SmtpProbeSession':
+        """Connect, read the banner and say hello (STARTTLS first if the host requires it)"""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(address or mx_host, SMTP_PORT), timeout=timeout
+        )
+        session = cls(mx_host, reader, writer, timeout)
+        try:
+            code, banner = await session.read_reply()
+            if code != 220:
+                raise SmtpProbeError(f"Unexpected banner {code}: {banner}")
+            session.capabilities['banner'] = banner
+            await session.hello(capabilities)
+        except BaseException:
+            session.close()
+            raise
+        return session
+
+    async def read_reply(self) -> Tuple[int, str]:
+        """Read one (possibly multiline) reply"""
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), timeout=self.timeout)
+            if not line:
+                raise SmtpProbeError("Connection closed by server")
+            text = line.decode('utf-8', 'replace').rstrip('\r\n')
+            try:
+                code = int(text[:3])
+            except ValueError:
+                raise SmtpProbeError(f"Malformed reply: {text!r}") from None
+            lines.append(text[4:])
+            if text[3:4] != '-':
+                self.last_used = time.time()
+                return code, '\n'.join(lines)
+
+    async def command(self, line: str) -> Tuple[int, str]:
+        self.writer.write(line.encode('utf-8') + b'\r\n')
+        await self.writer.drain()
+        return await self.read_reply()
+
+    async def pipeline(self, lines: List[str]) -> List[Tuple[int, str]]:
+        """Send several commands in one write and read their replies in order (RFC 2920)"""
+        self.writer.write(b''.join(line.encode('utf-8') + b'\r\n' for line in lines))
+        await self.writer.drain()
+        return [await self.read_reply() for _ in lines]
+
+    async def hello(self, cached: Optional[dict] = None):
+        """EHLO (or straight to HELO for hosts known not to speak ESMTP)"""
+        if cached and not cached['esmtp']:
+            await self._helo()
+        else:
+            code, message = await self.command(f'EHLO {HELO_HOSTNAME}')
+            if code == 250:
+                self._apply_extensions(parse_ehlo_extensions(message))
+            else:
+                await self._helo()
+
+        if cached:
+            self.capabilities['starttls_required'] = cached['starttls_required']
+            self.capabilities['max_recipients'] = cached['max_recipients']
+
+        if self.capabilities['starttls_required'] and self.capabilities['starttls']:
+            await self.starttls()
+
+    async def _helo(self):
+        code, message = await self.command(f'HELO {HELO_HOSTNAME}')
+        if code != 250:
+            raise SmtpProbeError(f"HELO rejected {code}: {message}")
+        self.capabilities['esmtp'] = False
+
+    def _apply_extensions(self, extensions: Dict[str, str]):
+        caps = self.capabilities
+        caps['esmtp'] = True
+        caps['extensions'] = extensions
+        caps['pipelining'] = 'PIPELINING' in extensions
+        caps['starttls'] = 'STARTTLS' in extensions
+        size = extensions.get('SIZE', '')
+        caps['size'] = int(size) if size.isdigit() else None
+        # RFC 9422 LIMITS RCPTMAX=n
+        for param in extensions.get('LIMITS', '').split():
+            name, _, value = param.partition('=')
+            if name.upper() == 'RCPTMAX' and value.isdigit():
+                caps['max_recipients'] = min(int(value), caps['max_recipients'])
+
+    async def starttls(self):
+        code, message = await self.command('STARTTLS')
+        if code != 220:
+            raise SmtpProbeError(f"STARTTLS refused {code}: {message}")
+        # MX certificates rarely match the name we connect to; we never send message data
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        await self.writer.start_tls(context, server_hostname=self.mx_host)
+        code, message = await self.command(f'EHLO {HELO_HOSTNAME}')
+        if code != 250:
+            raise SmtpProbeError(f"EHLO after STARTTLS rejected {code}: {message}")
+        starttls_required = self.capabilities['starttls_required']
+        max_recipients = self.capabilities['max_recipients']
+        self._apply_extensions(parse_ehlo_extensions(message))
+        self.capabilities['starttls_required'] = starttls_required
+        self.capabilities['max_recipients'] = max_recipients
+
+    async def check_recipients(self, recipients: List[str]) -> Dict[str, dict]:
+        """
+        Run MAIL FROM / RCPT TO for every recipient, in batches of max_recipients,
+        with RSET between batches. Returns {recipient: {'code', 'message', 'stage'}}
+        where stage is 'rcpt', or 'mail' when the envelope itself was refused.
+        """
+        results: Dict[str, dict] = {}
+        caps = self.capabilities
+        pending = list(recipients)
+
+        while pending:
+            batch = pending[:caps['max_recipients']]
+            mail_cmd = f'MAIL FROM:<{MAIL_FROM}>'
+            rcpt_cmds = [f'RCPT TO:<{r}>' for r in batch]
+
+            if caps['pipelining']:
+                replies = await self.pipeline([mail_cmd] + rcpt_cmds)
+                mail_reply, rcpt_replies = replies[0], replies[1:]
+            else:
+                mail_reply = await self.command(mail_cmd)
+                rcpt_replies = []
+                if mail_reply[0] == 250:
+                    for cmd in rcpt_cmds:
+                        rcpt_replies.append(await self.command(cmd))
+
+            mail_code, mail_message = mail_reply
+            if mail_code != 250:
+                if mail_code == 530 and caps['starttls'] and not caps['starttls_required']:
+                    raise SmtpStartTlsRequired(mail_message)
+                for r in batch:
+                    results[r] = {'code': mail_code, 'message': mail_message, 'stage': 'mail'}
+                pending = pending[len(batch):]
+                await self.command('RSET')
+                continue
+
+            consumed = len(batch)
+            for index, (r, (code, message)) in enumerate(zip(batch, rcpt_replies)):
+                if code == 452 and index > 0 and ('4.5.3' in message or 'too many' in message.lower()):
+                    # Server's real recipient limit is lower; retry the rest in smaller batches
+                    caps['max_recipients'] = index
+                    consumed = index
+                    break
+                results[r] = {'code': code, 'message': message, 'stage': 'rcpt'}
+
+            pending = pending[consumed:]
+            if pending:
+                await self.command('RSET')
+
+        return results
+
+    async def quit(self):
+        """Send QUIT without waiting for the reply, then close"""
+        try:
+            self.writer.write(b'QUIT\r\n')
+        except Exception:
+            pass
+        self.close()
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class SmtpSessionPool:
+    """
+    Idle, already-greeted sessions opened ahead of time for MX hosts that upcoming
+    probes will need. Capped in total and per host; idle sessions are closed quickly.
+    """
+
+    def __init__(self, max_sessions: int = WARM_MAX_SESSIONS, max_per_host: int = WARM_MAX_PER_HOST,
+                 idle_seconds: float = WARM_IDLE_SECONDS):
+        self.max_sessions = max_sessions
+        self.max_per_host = max_per_host
+        self.idle_seconds = idle_seconds
+        self._idle: Dict[str, List[SmtpProbeSession]] = {}
+        self._opening: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(sessions) for sessions in self._idle.values())
+
+    def reap(self):
+        """Close sessions idle for too long or owned by another event loop"""
+        now = time.time()
+        loop = asyncio.get_running_loop()
+        for mx_host in list(self._idle):
+            keep = []
+            for session in self._idle[mx_host]:
+                if session.loop is loop and now - session.last_used < self.idle_seconds:
+                    keep.append(session)
+                else:
+                    session.close()
+            if keep:
+                self._idle[mx_host] = keep
+            else:
+                del self._idle[mx_host]
+
+    def acquire(self, mx_host: str) -> Optional[SmtpProbeSession]:
+        """Take a warm session for this host, if one is still fresh"""
+        self.reap()
+        sessions = self._idle.get(mx_host)
+        if not sessions:
+            return None
+        session = sessions.pop()
+        if not sessions:
+            del self._idle[mx_host]
+        return session
+
+    def wants(self, mx_host: str) -> bool:
+        """Whether there is room for another warm session to this host"""
+        self.reap()
+        pending = sum(self._opening.values())
+        per_host = len(self._idle.get(mx_host, [])) + self._opening.get(mx_host, 0)
+        return len(self) + pending < self.max_sessions and per_host < self.max_per_host
+
+    async def fill(self, mx_host: str, opener) -> bool:
+        """Open one session with `opener(mx_host)` and park it, if there is room"""
+        if not self.wants(mx_host):
+            return False
+        self._opening[mx_host] = self._opening.get(mx_host, 0) + 1
+        try:
+            session = await opener(mx_host)
+        finally:
+            self._opening[mx_host] -= 1
+            if not self._opening[mx_host]:
+                del self._opening[mx_host]
+        if session is None:
+            return False
+        self._idle.setdefault(mx_host, []).append(session)
+        return True
+
+    def close_all(self):
+        for sessions in self._idle.values():
+            for session in sessions:
+                session.close()
+        self._idle.clear()
+
+
+class SmtpProber:
+    """
+    Entry point for SMTP mailbox probes.
+    Guards connects with the per-host / per-IP circuit breaker and keeps the
+    capability cache up to date with what each session learned.
+    """
+
+    def __init__(self):
+        self.capabilities = SmtpCapabilityCache()
+        self.pool = SmtpSessionPool()
+        self._ip_cache: Dict[str, Tuple[str, float]] = {}
+
+    async def resolve_ip(self, mx_host: str) -> Optional[str]:
+        """Resolve an MX host to its first IPv4 address (cached)"""
+        cached = self._ip_cache.get(mx_host)
+        if cached and (time.time() - cached[1]) < IP_CACHE_TTL:
+            return cached[0] or None
+        try:
+            loop = asyncio.get_running_loop()
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(mx_host, SMTP_PORT, family=socket.AF_INET, type=socket.SOCK_STREAM),
+                timeout=3
+            )
+            ip = infos[0][4][0] if infos else ''
+        except Exception:
+            ip = ''
+        self._ip_cache[mx_host] = (ip, time.time())
+        return ip or None
+
+    async def open_session(self, mx_host: str, timeout: float = PROBE_TIMEOUT) -> Optional[SmtpProbeSession]:
+        """
+        Open a session to an MX host, or return None when it is unreachable
+        (without touching the network while its circuit is open)
+        """
+        mx_ip = await self.resolve_ip(mx_host)
+        if not smtp_circuit_breaker.allow(mx_host, mx_ip):
+            return None
+
+        try:
+            session = await SmtpProbeSession.open(
+                mx_host, address=mx_ip, timeout=timeout,
+                capabilities=self.capabilities.get(mx_host)
+            )
+        except asyncio.TimeoutError:
+            if timeout < PROBE_TIMEOUT:
+                # The caller's deadline cut the connect short: no verdict on the host
+                smtp_circuit_breaker.release(mx_host, mx_ip)
+            else:
+                smtp_circuit_breaker.record_failure(mx_host, mx_ip)
+            return None
+        except Exception:
+            smtp_circuit_breaker.record_failure(mx_host, mx_ip)
+            return None
+        except BaseException:
+            # Cancelled (deadline wait_for, hedge loser): free the half-open trial
+            smtp_circuit_breaker.release(mx_host, mx_ip)
+            raise
+
+        smtp_circuit_breaker.record_success(mx_host, mx_ip)
+        self.capabilities.set(mx_host, session.capabilities)
+        return session
+
+    async def probe(self, mx_host: str, recipients: List[str],
+                    timeout: float = PROBE_TIMEOUT) -> Optional[Dict[str, dict]]:
+        """
+        Probe recipients on one MX host over a single session.
+        Returns {recipient: {'code', 'message', 'stage'}} or None if the host is unreachable.
+        """
+        session = self.pool.acquire(mx_host)
+        if session is not None:
+            session.timeout = timeout
+            try:
+                results = await session.check_recipients(recipients)
+                self.capabilities.set(mx_host, session.capabilities)
+                await session.quit()
+                return results
+            except Exception:
+                # The server may have dropped the idle connection; start over
+                session.close()
+
+        session = await self.open_session(mx_host, timeout)
+        if session is None:
+            return None
+
+        try:
+            try:
+                return await session.check_recipients(recipients)
+            except SmtpStartTlsRequired:
+                session.close()
+                self.capabilities.update(mx_host, starttls_required=True)
+                session = await self.open_session(mx_host, timeout)
+                if session is None:
+                    return None
+                return await session.check_recipients(recipients)
+        except (SmtpProbeError, OSError, asyncio.TimeoutError) as e:
+            logger.debug(f"SMTP probe to {mx_host} failed: {e}")
+            return None
+        finally:
+            if session is not None:
+                self.capabilities.set(mx_host, session.capabilities)
+                await session.quit()
+
+    async def warm(self, mx_host: str) -> bool:
+        """Open and greet a session ahead of time so the next probe skips connect + banner + EHLO"""
+        return await self.pool.fill(mx_host, self.open_session)
+
+
+# Singleton instance
+smtp_prober = SmtpProber()
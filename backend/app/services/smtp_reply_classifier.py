@@ -0,0 +1,182 @@
+"""
+SMTP Reply Classifier
+Maps SMTP replies (basic code + RFC 3463 enhanced status code + text) to a structured reason.
+Enhanced codes are parsed first; provider-specific wording is matched with one precompiled
+regex per provider family. Pure functions, cheap enough to re-run over stored transcripts.
+"""
+
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from app.services.provider_index import provider_index
+
+
+class SmtpReason(str, Enum):
+    """Why a mailbox probe ended the way it did (values match the `smtp` result field)"""
+    VALID = 'responsive'
+    USER_NOT_FOUND = 'user_not_found'
+    INVALID_MAILBOX = 'invalid_mailbox'
+    ACCOUNT_DISABLED = 'account_disabled'
+    MAILBOX_FULL = 'mailbox_full'
+    REJECTED = 'rejected'
+    POLICY_BLOCKED = 'policy_blocked'
+    RATE_LIMITED = 'rate_limited'
+    GREYLISTED = 'greylisted'
+    TEMPORARY_FAILURE = 'temporary_failure'
+    UNKNOWN = 'unknown'
+
+
+# class.subject.detail, e.g. "5.1.1"; must not be part of a longer dotted number (IPs, versions)
+_ENHANCED_RE = re.compile(r'(?<![\d.])([245])\.(\d{1,3})\.(\d{1,3})(?![\d.]*\d)')
+
+# Enhanced codes that settle the question on their own
+_DEFINITIVE = {
+    (5, 1, 1): SmtpReason.USER_NOT_FOUND,     # Bad destination mailbox address
+    (5, 1, 6): SmtpReason.USER_NOT_FOUND,     # Mailbox has moved, no forwarding address
+    (5, 1, 2): SmtpReason.INVALID_MAILBOX,    # Bad destination system address
+    (5, 1, 3): SmtpReason.INVALID_MAILBOX,    # Bad destination mailbox address syntax
+    (5, 1, 10): SmtpReason.INVALID_MAILBOX,   # Recipient address has null MX
+    (5, 2, 1): SmtpReason.ACCOUNT_DISABLED,   # Mailbox disabled, not accepting messages
+    (5, 2, 2): SmtpReason.MAILBOX_FULL,       # Mailbox full
+    (4, 2, 2): SmtpReason.MAILBOX_FULL,       # Mailbox full (transient)
+}
+
+# Enhanced codes that only hint; provider wording may override them
+_HINTS = {
+    (5, 4, 1): SmtpReason.USER_NOT_FOUND,     # Microsoft: "Recipient address rejected: Access denied"
+    (4, 7, 1): SmtpReason.GREYLISTED,
+    (5, 1): SmtpReason.USER_NOT_FOUND,
+    (5, 2): SmtpReason.REJECTED,
+    (5, 7): SmtpReason.POLICY_BLOCKED,
+    (4, 7): SmtpReason.RATE_LIMITED,
+    (4, 2): SmtpReason.TEMPORARY_FAILURE,
+    (4, 4): SmtpReason.TEMPORARY_FAILURE,
+}
+
+# Basic reply code fallback when neither the enhanced code nor the text decides
+_BASIC = {
+    421: SmtpReason.TEMPORARY_FAILURE,
+    450: SmtpReason.TEMPORARY_FAILURE,
+    451: SmtpReason.TEMPORARY_FAILURE,
+    452: SmtpReason.TEMPORARY_FAILURE,
+    550: SmtpReason.REJECTED,
+    551: SmtpReason.USER_NOT_FOUND,
+    552: SmtpReason.MAILBOX_FULL,
+    553: SmtpReason.INVALID_MAILBOX,
+    554: SmtpReason.REJECTED,
+}
+
+
+def _family_regex(**groups: str) -> re.Pattern:
+    """One alternation per family; the named group that matched is the reason (input is lowercased)"""
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in groups.items()))
+
+
+_FAMILY_PATTERNS = {
+    'google': _family_regex(
+        user_not_found=r"account that you tried to reach does not exist|no such user",
+        account_disabled=r"account that you tried to reach is disabled|inactive user",
+        mailbox_full=r"out of storage space|over (?:its|their) quota|mailbox is full",
+        rate_limited=r"receiving mail at a rate|try again later, closing connection|temporarily rate limited",
+        policy_blocked=r"unusual rate of unsolicited mail|likely unsolicited mail|our system has detected|"
+                       r"ip reputation|not authorized to send",
+    ),
+    'microsoft': _family_regex(
+        user_not_found=r"recipientnotfound|recipient address rejected: access denied|"
+                       r"requested action not taken: mailbox unavailable|mailbox unavailable",
+        account_disabled=r"mailbox is disabled|recipient is disabled",
+        mailbox_full=r"mailbox full|storage quota|quota exceeded",
+        policy_blocked=r"\(s\d{4}\)|banned sending ip|on our block list|blocked using|"
+                       r"5\.7\.(?:5\d\d|6\d\d|7\d\d)|access denied, banned",
+        rate_limited=r"too many connections|throttl",
+    ),
+    'yahoo': _family_regex(
+        user_not_found=r"doesn't have a (?:yahoo|aol|ymail)\S* account|user doesn't exist|"
+                       r"delivery error: dd this user",
+        account_disabled=r"mailbox is disabled|\(554\.30\)",
+        rate_limited=r"\[ts0\d\]|temporarily deferred",
+        policy_blocked=r"\[bl\d\d\]|\[ts\d\d\] messages from .* permanently deferred",
+    ),
+    'generic': _family_regex(
+        greylisted=r"greylist|graylist|try again later|please retry|come back later",
+        mailbox_full=r"mailbox (?:is )?full|over ?quota|quota exceeded|exceeded storage|insufficient storage",
+        account_disabled=r"disabled|suspended|deactivated|inactive|\blocked\b|no longer active",
+        user_not_found=r"user unknown|unknown user|no such (?:user|recipient|mailbox|account)|"
+                       r"does not exist|doesn't exist|not exist|mailbox not found|invalid recipient|"
+                       r"recipient (?:address )?rejected|address rejected|unrouteable|not a valid mailbox|"
+                       r"mailbox unavailable|unknown recipient|user not found|no mailbox",
+        policy_blocked=r"spamhaus|blacklist|blocklist|block list|blocked|\brbl\b|listed (?:at|in|on)|"
+                       r"reputation|spam|not authori[sz]ed|relay(?:ing)? (?:access )?denied|"
+                       r"policy|reverse dns|ptr record|rejected due to",
+        rate_limited=r"rate limit|too many (?:connections|messages)|throttl|slow down",
+    ),
+}
+
+
+def provider_family(mx_host: Optional[str]) -> Optional[str]:
+    """Which provider-specific regex applies to an MX host"""
+    return provider_index.family(provider_index.mx_provider(mx_host))
+
+
+def parse_enhanced_code(code: int, message: str) -> Optional[Tuple[int, int, int]]:
+    """Extract the RFC 3463 enhanced status code whose class agrees with the reply code"""
+    match = _ENHANCED_RE.match(message) or _ENHANCED_RE.search(message)
+    if not match:
+        return None
+    enhanced = (int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    if enhanced[0] != code // 100:
+        return None
+    return enhanced
+
+
+def classify_reply(code: int, message: str, mx_host: Optional[str] = None) -> SmtpReason:
+    """
+    Classify one SMTP reply.
+    Order: 2xx -> definitive enhanced code -> provider family regex -> generic regex
+    -> enhanced-code hint -> basic reply code.
+    """
+    if 200 <= code < 300:
+        return SmtpReason.VALID
+    return _classify(code, message.lower(), provider_family(mx_host))
+
+
+@lru_cache(maxsize=65536)
+def _classify(code: int, message: str, family: Optional[str]) -> SmtpReason:
+    # Identical replies repeat heavily across a bulk job or transcript archive
+    enhanced = parse_enhanced_code(code, message)
+    if enhanced in _DEFINITIVE:
+        return _DEFINITIVE[enhanced]
+
+    for name in ((family, 'generic') if family else ('generic',)):
+        match = _FAMILY_PATTERNS[name].search(message)
+        if match:
+            reason = SmtpReason(match.lastgroup)
+            # Wording about retrying means nothing on a permanent failure
+            if code >= 500 and reason in (SmtpReason.GREYLISTED, SmtpReason.RATE_LIMITED):
+                continue
+            return reason
+
+    if enhanced:
+        hint = _HINTS.get(enhanced) or _HINTS.get(enhanced[:2])
+        if hint:
+            return hint
+
+    reason = _BASIC.get(code)
+    if reason:
+        return reason
+    if 400 <= code < 500:
+        return SmtpReason.TEMPORARY_FAILURE
+    if 500 <= code < 600:
+        return SmtpReason.REJECTED
+    return SmtpReason.UNKNOWN
+
+
+def classify_transcript_line(line: str, mx_host: Optional[str] = None) -> SmtpReason:
+    """Classify a raw reply line such as '550 5.1.1 <x@y.com>: User unknown'"""
+    try:
+        code = int(line[:3])
+    except (ValueError, TypeError):
+        return SmtpReason.UNKNOWN
+    return classify_reply(code, line[4:], mx_host)
@@ -0,0 +1,75 @@
+"""
+SMTP Session Warmer
+Look-ahead connection warming for bulk jobs: while the current batch is being probed,
+open and greet sessions to the MX hosts the upcoming addresses will hit most,
+so their connect and banner latency is already paid when the probes arrive.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import List
+
+from app.services.smtp_agent import smtp_dispatcher
+from app.services.smtp_prober import smtp_prober
+from app.services.smtp_reply_classifier import provider_family
+
+logger = logging.getLogger(__name__)
+
+WARM_LOOKAHEAD = int(os.getenv('SMTP_WARM_LOOKAHEAD', '1000'))   # upcoming addresses to scan
+WARM_MAX_HOSTS = int(os.getenv('SMTP_WARM_MAX_HOSTS', '10'))      # hottest hosts warmed per pass
+WARM_MAX_DOMAINS = 200                                           # unique domains resolved per pass
+WARM_DNS_CONCURRENCY = int(os.getenv('SMTP_WARM_DNS_CONCURRENCY', '20'))  # MX lookups in flight
+
+
+class SmtpSessionWarmer:
+    """Warms sessions to the hottest MX hosts among upcoming addresses"""
+
+    def __init__(self, verifier=None, max_hosts: int = WARM_MAX_HOSTS):
+        self.verifier = verifier
+        self.max_hosts = max_hosts
+
+    async def warm_upcoming(self, emails: List[str]) -> int:
+        """Returns how many sessions were opened"""
+        # Probes go to remote agents or are skipped entirely: nothing to warm locally
+        if await smtp_dispatcher.agents_available() or not await smtp_dispatcher.is_available():
+            return 0
+
+        verifier = self.verifier
+        if verifier is None:
+            from app.services.email_verifier import email_verifier as verifier
+
+        domains = Counter(e.rsplit('@', 1)[1].lower() for e in emails if '@' in e)
+        top = domains.most_common(WARM_MAX_DOMAINS)
+        semaphore = asyncio.Semaphore(WARM_DNS_CONCURRENCY)
+
+        async def lookup(domain: str):
+            # MX lookups are blocking; this also pre-fills the domain cache
+            async with semaphore:
+                return await asyncio.to_thread(verifier._check_mx_cached, domain)
+
+        lookups = await asyncio.gather(*(lookup(domain) for domain, _ in top), return_exceptions=True)
+        hosts = Counter()
+        for (domain, count), mx in zip(top, lookups):
+            if isinstance(mx, BaseException):
+                continue
+            mx_valid, mx_records = mx
+            if not mx_valid or not mx_records:
+                continue
+            # Google / Microsoft addresses go to the specialized HTTP checkers, not SMTP
+            if provider_family(mx_records[0]) in ('google', 'microsoft'):
+                continue
+            hosts[mx_records[0]] += count
+
+        targets = [host for host, _ in hosts.most_common(self.max_hosts) if smtp_prober.pool.wants(host)]
+        if not targets:
+            return 0
+        opened = await asyncio.gather(*(smtp_prober.warm(host) for host in targets), return_exceptions=True)
+        warmed = sum(1 for ok in opened if ok is True)
+        logger.debug(f"Warmed {warmed} SMTP sessions for {len(targets)} upcoming MX hosts")
+        return warmed
+
+
+# Singleton instance
+smtp_warmer = SmtpSessionWarmer()
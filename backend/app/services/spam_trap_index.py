@@ -0,0 +1,155 @@
+"""
+Spam Trap Index
+Known spam-trap addresses from the spam_traps table, held in memory as 64-bit hash
+prefixes keyed to their risk level, plus the set of domains that have any trap. Most
+addresses are ruled out by the domain set alone; the rest cost one sha256 and one dict
+probe. Rows are stored as sha256(canonical address) so the table never holds plain
+addresses.
+
+The index refreshes incrementally in a background thread: every SPAM_TRAP_REFRESH_INTERVAL
+seconds it loads rows with an id above the last one seen, and reloads fully when rows were
+deleted. Lookups only read the in-memory snapshot; async callers load it once with
+`await ensure_loaded()` so the event loop never waits on the database.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Optional
+
+from app.services.domain_normalizer import to_ascii
+from app.services.email_canonicalizer import canonicalize_email
+
+logger = logging.getLogger(__name__)
+
+SPAM_TRAP_REFRESH_INTERVAL = float(os.getenv('SPAM_TRAP_REFRESH_INTERVAL', '60'))
+RISK_LEVELS = ('high', 'medium', 'low')
+ANY_DOMAIN = '*'  # a trap row without a domain disables the domain pre-filter
+
+
+def hash_email(email: str) -> str:
+    """Value stored in SpamTrap.email_hash for an address"""
+    return hashlib.sha256(canonicalize_email(email).encode('utf-8')).hexdigest()
+
+
+def _key(email_hash: str) -> int:
+    # 64-bit prefix: compact, and collisions are negligible at any realistic table size
+    return int(email_hash[:16], 16)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class SpamTrapIndex:
+    """In-memory spam-trap lookup backed by the spam_traps table"""
+
+    def __init__(self, refresh_interval: float = SPAM_TRAP_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._traps: Dict[int, str] = {}
+        self._domains: FrozenSet[str] = frozenset()
+        self._last_id = 0
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._background = threading.Lock()  # held while a background refresh runs
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        return len(self._traps)
+
+    def _ensure_fresh(self):
+        # Without a running event loop the first use may load in place; otherwise refreshes
+        # happen in a background thread and the current snapshot is served meanwhile
+        if not self._loaded and not _on_event_loop():
+            self.refresh(full=True)
+        elif not self._loaded or time.monotonic() - self._checked_at >= self.refresh_interval:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        if not self._background.acquire(blocking=False):
+            return
+        self._checked_at = time.monotonic()
+        threading.Thread(target=self._background_refresh, name='spam-trap-refresh', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh(full=not self._loaded)
+        finally:
+            self._background.release()
+
+    async def ensure_loaded(self):
+        """Load the table off the event loop before the first lookup"""
+        if not self._loaded:
+            await asyncio.to_thread(self.refresh, True)
+
+    def lookup(self, email: str, domain: Optional[str] = None) -> Optional[str]:
+        """Risk level of a known spam trap ('high', 'medium', 'low'), else None"""
+        self._ensure_fresh()
+        canonical = canonicalize_email(email)
+        domain = domain or canonical.rpartition('@')[2]
+        domains = self._domains
+        if domain not in domains and ANY_DOMAIN not in domains:
+            return None
+        return self._traps.get(_key(hashlib.sha256(canonical.encode('utf-8')).hexdigest()))
+
+    def refresh(self, full: bool = False) -> int:
+        """Load new rows (or everything). Returns how many rows were loaded."""
+        if not self._lock.acquire(blocking=full):
+            return 0
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                return self._refresh(full)
+            except Exception as e:
+                logger.debug(f"Spam trap table unavailable: {e}")
+                return 0
+        finally:
+            # Retried after the refresh interval, not on every lookup
+            self._loaded = True
+            self._lock.release()
+
+    def _refresh(self, full: bool) -> int:
+        from sqlalchemy import func
+        from app.core.database import SessionLocal
+        from app.models.models import SpamTrap
+
+        db = SessionLocal()
+        try:
+            if not full:
+                count, max_id = db.query(func.count(SpamTrap.id), func.max(SpamTrap.id)).one()
+                if (max_id or 0) == self._last_id and count == len(self._traps):
+                    return 0
+                # Rows were deleted: start over
+                full = count - len(self._traps) != (max_id or 0) - self._last_id or (max_id or 0) < self._last_id
+
+            query = db.query(SpamTrap.id, SpamTrap.email_hash, SpamTrap.domain, SpamTrap.risk_level)
+            if not full:
+                query = query.filter(SpamTrap.id > self._last_id)
+            rows = query.order_by(SpamTrap.id).all()
+        finally:
+            db.close()
+
+        # Build on copies and swap, so lookups never see a half-applied refresh
+        traps = {} if full else dict(self._traps)
+        domains = set() if full else set(self._domains)
+        last_id = 0 if full else self._last_id
+        for row_id, email_hash, domain, risk_level in rows:
+            traps[_key(email_hash.lower())] = risk_level if risk_level in RISK_LEVELS else 'high'
+            domains.add(to_ascii(domain) if domain else ANY_DOMAIN)
+            last_id = max(last_id, row_id)
+        self._traps, self._domains, self._last_id = traps, frozenset(domains), last_id
+        if rows:
+            logger.info(f"Loaded {len(rows)} spam trap entries ({len(traps)} total)")
+        return len(rows)
+
+
+# Singleton instance
+spam_trap_index = SpamTrapIndex()
@@ -0,0 +1,109 @@
+"""
+Email Syntax Validator
+One validator shared by the API request models and the verification pipeline.
+
+Plain ASCII addresses (the vast majority) are checked against a precompiled RFC 5322
+dot-atom / RFC 1123 hostname grammar plus the RFC 5321 length limits, with no object
+construction or IDNA work. ASCII mailboxes at internationalised or punycode domains take
+the same grammar on the domain's ASCII form from the shared IDNA memo (domain_normalizer).
+Anything else - non-ASCII local parts and every invalid address - goes to email_validator,
+which does full IDN handling and produces the user-facing error message. The fast paths
+only ever accept addresses email_validator would accept too.
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+from email_validator import validate_email, EmailNotValidError
+
+from app.services.domain_normalizer import domain_forms
+
+VALID_MESSAGE = "Valid syntax"
+
+EMAIL_MAX_LENGTH = 254
+LOCAL_PART_MAX_LENGTH = 64
+
+# RFC 5322 3.2.3 atext
+_ATEXT = r"A-Za-z0-9!#$%&'*+/=?^_`{|}~-"
+# RFC 1123 hostname label, at most 63 chars; labels with "--" in positions 3-4 (punycode
+# or reserved R-LDH) need IDNA checks, so they take the slow path
+_LABEL = r"(?!..--)[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+# At least one dot and a TLD ending in a letter, as for globally deliverable addresses
+_FAST_EMAIL_RE = re.compile(
+    rf"[{_ATEXT}]+(?:\.[{_ATEXT}]+)*@(?:{_LABEL}\.)+(?!..--)(?:[A-Za-z0-9][A-Za-z0-9-]{{0,61}})?[A-Za-z]\Z"
+)
+
+# ASCII form of an IDN domain: punycode labels are allowed once domain_forms accepted them
+_IDN_LABEL = r"(?!(?!xn--)..--)[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?"
+_FAST_IDN_EMAIL_RE = re.compile(
+    rf"[{_ATEXT}]+(?:\.[{_ATEXT}]+)*@(?:{_IDN_LABEL}\.)+(?:{_IDN_LABEL})\Z"
+)
+_TLD_RE = re.compile(r"[A-Za-z]\Z")
+# Unicode domain characters the memoised IDNA path accepts as-is (letters, marks, digits)
+_IDN_CHARS_RE = re.compile(r"[\w.-]+\Z")
+
+# Special-use / reserved names email_validator refuses (RFC 6761 and friends)
+_SPECIAL_USE_RE = re.compile(r"(?:^|\.)(?:arpa|invalid|local|localhost|onion|test)\Z", re.IGNORECASE)
+
+
+class SyntaxValidator:
+    """RFC-faithful email syntax validation with an ASCII fast path"""
+
+    def _fast_valid(self, email: str) -> bool:
+        if len(email) > EMAIL_MAX_LENGTH or not _FAST_EMAIL_RE.match(email):
+            return False
+        local, _, domain = email.rpartition('@')
+        return len(local) <= LOCAL_PART_MAX_LENGTH and not _SPECIAL_USE_RE.search(domain)
+
+    def _idn_fast_valid(self, email: str) -> bool:
+        """ASCII local part at an internationalised domain, via the shared IDNA memo"""
+        local, at, domain = email.rpartition('@')
+        if not at or not local.isascii() or domain.endswith('.') or '_' in domain or not _IDN_CHARS_RE.match(domain):
+            return False
+        forms = domain_forms(domain)
+        if forms is None:
+            return False
+        ascii_email = f"{local}@{forms.ascii}"
+        return (
+            len(ascii_email) <= EMAIL_MAX_LENGTH
+            and len(f"{local}@{forms.unicode}".encode('utf-8')) <= EMAIL_MAX_LENGTH
+            and len(local) <= LOCAL_PART_MAX_LENGTH
+            and bool(_FAST_IDN_EMAIL_RE.match(ascii_email))
+            and bool(_TLD_RE.search(forms.ascii))
+            and not _SPECIAL_USE_RE.search(forms.ascii)
+        )
+
+    def validate(self, email: str) -> Tuple[bool, str]:
+        """(valid, message) for one address"""
+        if self._fast_valid(email) or self._idn_fast_valid(email):
+            return True, VALID_MESSAGE
+        try:
+            validate_email(email, check_deliverability=False)
+            return True, VALID_MESSAGE
+        except EmailNotValidError as e:
+            return False, str(e)
+
+    def is_valid(self, email: str) -> bool:
+        return self.validate(email)[0]
+
+    def validate_many(self, emails: Iterable[str]) -> List[Tuple[bool, str]]:
+        """(valid, message) for each address, in input order"""
+        fast_valid = self._fast_valid
+        validate = self.validate
+        return [(True, VALID_MESSAGE) if fast_valid(email) else validate(email) for email in emails]
+
+    def clean_list(self, emails: Iterable[str]) -> List[str]:
+        """Request-model helper: strip, then drop invalid and duplicate (case-insensitive) addresses"""
+        stripped = [e.strip() for e in emails]
+        cleaned = []
+        seen = set()
+        for email, (valid, _) in zip(stripped, self.validate_many(stripped)):
+            key = email.lower()
+            if valid and key not in seen:
+                seen.add(key)
+                cleaned.append(email)
+        return cleaned
+
+
+# Singleton instance
+syntax_validator = SyntaxValidator()
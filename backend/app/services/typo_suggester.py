@@ -0,0 +1,121 @@
+"""
+Typo Domain Suggester
+"Did you mean" suggestions for misspelt mail domains (gmial.com, hotmial.co, yaho.com)
+from a symmetric-delete (SymSpell-style) index: every variant of the known domains with
+up to MAX_EDIT_DISTANCE characters deleted is precomputed, so a lookup only generates
+the deletes of the input and verifies the few candidates they share - no network and no
+scan over the dictionary.
+"""
+
+import os
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.services.provider_index import provider_index
+
+MAX_EDIT_DISTANCE = 2
+SHORT_DOMAIN_LENGTH = 9  # shorter domains only get one-edit suggestions (att.com is not aol.com)
+
+# Most-used mailbox domains, most popular first (ties resolve to the earlier entry)
+KNOWN_MAIL_DOMAINS = [
+    'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'icloud.com', 'aol.com',
+    'live.com', 'msn.com', 'me.com', 'mac.com', 'googlemail.com', 'ymail.com', 'rocketmail.com',
+    'protonmail.com', 'proton.me', 'pm.me', 'zoho.com', 'fastmail.com', 'gmx.com', 'gmx.net',
+    'gmx.de', 'mail.com', 'yandex.com', 'yandex.ru', 'mail.ru', 'web.de', 't-online.de',
+    'comcast.net', 'verizon.net', 'att.net', 'sbcglobal.net', 'bellsouth.net', 'cox.net',
+    'charter.net', 'earthlink.net', 'juno.com', 'optonline.net', 'shaw.ca', 'rogers.com',
+    'sympatico.ca', 'btinternet.com', 'sky.com', 'virginmedia.com', 'orange.fr', 'wanadoo.fr',
+    'free.fr', 'sfr.fr', 'laposte.net', 'libero.it', 'virgilio.it', 'tiscali.it', 'alice.it',
+    'bigpond.com', 'optusnet.com.au', 'qq.com', '163.com', '126.com', 'naver.com',
+    'rediffmail.com', 'uol.com.br', 'bol.com.br', 'terra.com.br',
+    'yahoo.co.uk', 'yahoo.co.jp', 'yahoo.co.in', 'yahoo.fr', 'yahoo.de', 'yahoo.es', 'yahoo.it',
+    'yahoo.ca', 'yahoo.com.br', 'yahoo.com.au', 'hotmail.co.uk', 'hotmail.fr', 'hotmail.de',
+    'hotmail.es', 'hotmail.it', 'hotmail.com.br', 'outlook.fr', 'outlook.de', 'outlook.es',
+    'live.co.uk', 'live.fr', 'live.nl', 'live.ca',
+]
+
+# Real mailbox domains within a few edits of a popular one: never suggested a "fix"
+# (domains with their own MX records are also left alone once Phase 2 has seen them)
+NOT_TYPOS = {'email.com', 'orange.es', 'orange.pl', 'orange.net', 'gmx.at', 'gmx.ch', 'mail.de'}
+
+# Misspellings of these (one edit, same first letter) are treated as dead addresses
+# without probing: typo-squatted look-alikes either bounce or are spam traps
+TYPO_SKIP_TARGETS = {'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'icloud.com', 'googlemail.com'}
+TYPO_SKIP_PROBES = os.getenv('TYPO_SKIP_PROBES', 'true').lower() == 'true'
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """The word and every string obtained by deleting up to max_distance characters"""
+    variants = {word}
+    for n in range(1, min(max_distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), n):
+            variants.add(''.join(c for i, c in enumerate(word) if i not in positions))
+    return variants
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)"""
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class TypoDomainIndex:
+    """Symmetric-delete index over known mail domains"""
+
+    def __init__(self, domains: List[str] = KNOWN_MAIL_DOMAINS, max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        self.rank = {domain: i for i, domain in enumerate(domains)}
+        self._index: Dict[str, List[str]] = {}
+        for domain in domains:
+            for variant in _deletes(domain, max_distance):
+                self._index.setdefault(variant, []).append(domain)
+
+    @lru_cache(maxsize=65536)
+    def lookup(self, domain: str) -> Optional[Tuple[str, int]]:
+        """(suggested domain, edit distance) for a likely misspelling, else None"""
+        domain = domain.lower().rstrip('.')
+        # Known domains, and other country domains of known providers, are not typos
+        if domain in self.rank or domain in NOT_TYPOS or provider_index.domain_provider(domain):
+            return None
+
+        max_distance = 1 if len(domain) < SHORT_DOMAIN_LENGTH else self.max_distance
+        candidates = set()
+        for variant in _deletes(domain, max_distance):
+            candidates.update(self._index.get(variant, ()))
+
+        best = None
+        for candidate in candidates:
+            if abs(len(candidate) - len(domain)) > max_distance:
+                continue
+            distance = _edit_distance(domain, candidate)
+            if distance <= max_distance:
+                key = (distance, self.rank[candidate])
+                if best is None or key < best[0]:
+                    best = (key, candidate)
+        return (best[1], best[0][0]) if best else None
+
+    def suggest(self, domain: str) -> Optional[str]:
+        match = self.lookup(domain)
+        return match[0] if match else None
+
+    def is_obvious_typo(self, domain: str) -> bool:
+        """One edit away from a major consumer domain, keeping its first letter"""
+        match = self.lookup(domain)
+        if not match:
+            return False
+        suggestion, distance = match
+        return distance == 1 and suggestion in TYPO_SKIP_TARGETS and domain[:1].lower() == suggestion[0]
+
+
+# Singleton instance
+typo_index = TypoDomainIndex()
@@ -0,0 +1,153 @@
+"""
+Verification Result
+Compact, slotted result of one verification. It behaves as a mutable mapping with exactly
+the keys of the former result dict (so `result['smtp']`, `.get()`, `**result` and
+`dict(result)` keep working), but stores the fields in slots instead of a per-result hash
+table, and final_status as a FinalStatus enum member. Bulk jobs hold one of these per
+address, so the saving is several-fold across a 100k-address job.
+
+Keys outside the fixed fields (partial, canonical_email, ...) go to a small side dict
+that exists only when used.
+"""
+
+from collections.abc import MutableMapping
+from enum import StrEnum
+from typing import Any, Dict, Iterator
+
+
+class FinalStatus(StrEnum):
+    VALID_SAFE = 'valid_safe'
+    VALID_RISKY = 'valid_risky'
+    RISKY = 'risky'
+    INVALID = 'invalid'
+    INVALID_SYNTAX = 'invalid_syntax'
+    INVALID_DOMAIN = 'invalid_domain'
+    NO_MX = 'no_mx'
+    NO_MX_RECORDS = 'no_mx_records'
+    USER_NOT_FOUND = 'user_not_found'
+    MAILBOX_FULL = 'mailbox_full'
+    ACCOUNT_DISABLED = 'account_disabled'
+    DISPOSABLE = 'disposable'
+    SPAM_TRAP = 'spam_trap'
+    TEMPORARY_FAILURE = 'temporary_failure'
+    UNKNOWN = 'unknown'
+    ERROR = 'error'
+
+
+_STATUSES = {status.value: status for status in FinalStatus}
+
+# Field order is the key order of the serialised result
+FIELDS = (
+    'email', 'depth', 'syntax', 'domain', 'mx', 'mx_records', 'smtp', 'smtp_provider',
+    'catch_all', 'disposable', 'role_based', 'is_o365', 'spam_risk', 'final_status',
+    'safety_score', 'reason', 'has_social', 'social_platform', 'did_you_mean', 'spam_trap',
+    'details',
+)
+_FIELD_SET = frozenset(FIELDS)
+
+
+class VerificationResult(MutableMapping):
+    """Result of verifying one address"""
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, email: str, depth: str):
+        self.email = email
+        self.depth = depth
+        self.syntax = 'unknown'
+        self.domain = 'unknown'
+        self.mx = 'unknown'
+        self.mx_records = []
+        self.smtp = 'unknown'
+        self.smtp_provider = None
+        self.catch_all = False
+        self.disposable = False
+        self.role_based = False
+        self.is_o365 = False
+        self.spam_risk = 'unknown'
+        self.final_status = FinalStatus.UNKNOWN
+        self.safety_score = 0
+        self.reason = None
+        self.has_social = False
+        self.social_platform = None
+        self.did_you_mean = None
+        self.spam_trap = None
+        self.details = {}
+        self._extra = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key == 'final_status':
+            value = _STATUSES.get(value, value)
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _FIELD_SET or self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+        if not self._extra:
+            self._extra = None
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET or bool(self._extra and key in self._extra)
+
+    def __repr__(self) -> str:
+        return f"VerificationResult({self.to_dict()!r})"
+
+    def copy(self) -> 'VerificationResult':
+        """Copy with its own details dict (other values are shared, as with dict.copy())"""
+        clone = VerificationResult.__new__(VerificationResult)
+        for field in FIELDS:
+            setattr(clone, field, getattr(self, field))
+        clone.details = dict(self.details)
+        clone._extra = dict(self._extra) if self._extra else None
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with a plain-string final_status"""
+        # Spelled out: a dict display is about twice as fast as building it from FIELDS
+        data = {
+            'email': self.email,
+            'depth': self.depth,
+            'syntax': self.syntax,
+            'domain': self.domain,
+            'mx': self.mx,
+            'mx_records': self.mx_records,
+            'smtp': self.smtp,
+            'smtp_provider': self.smtp_provider,
+            'catch_all': self.catch_all,
+            'disposable': self.disposable,
+            'role_based': self.role_based,
+            'is_o365': self.is_o365,
+            'spam_risk': self.spam_risk,
+            'final_status': str(self.final_status),
+            'safety_score': self.safety_score,
+            'reason': self.reason,
+            'has_social': self.has_social,
+            'social_platform': self.social_platform,
+            'did_you_mean': self.did_you_mean,
+            'spam_trap': self.spam_trap,
+            'details': self.details,
+        }
+        if self._extra:
+            data.update(self._extra)
+        return data
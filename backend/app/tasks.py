@@ -7,14 +7,25 @@ from celery import shared_task
 from app.core.celery_app import celery_app
 from app.core.database import SessionLocal
 from app.services.email_verifier import email_verifier
+from app.services.batch_executor import batch_executor
+from app.services.batch_scoring import batch_scorer
+from app.services.http_client import http_client
+from app.services.smtp_prober import smtp_prober
+from app.services.smtp_warmer import smtp_warmer, WARM_LOOKAHEAD
 from app.models.models import BulkJob, VerificationHistory
+from collections import Counter
 from datetime import datetime
 import asyncio
 import structlog
 
 logger = structlog.get_logger()
 
-BATCH_SIZE = 5  # Process 5 emails concurrently
+BATCH_SIZE = 50  # Emails per verify_many batch (grouped by domain, one SMTP session per group)
+SHALLOW_BATCH_SIZE = 1000  # syntax / dns depth: no SMTP, so much larger batches
+SHALLOW_CONCURRENCY = 50  # domain groups resolved at once at syntax / dns depth
+WARM_EVERY = 50  # Re-plan pre-warmed SMTP sessions every 50 emails
+PHASE_MAJOR_THRESHOLD = 1000  # Lists this large run phase by phase across the whole job
+INVALID_STATUSES = ('invalid', 'invalid_syntax', 'invalid_domain', 'user_not_found', 'spam_trap')
 
 
 @celery_app.task(bind=True, name='app.tasks.verify_email', max_retries=3)
@@ -26,34 +37,63 @@ def verify_email_task(self, email: str) -> dict:
         try:
             result = loop.run_until_complete(email_verifier.verify_email(email))
             logger.info("email_verified", email=email, status=result.get('final_status'))
-            return result
+            return result.to_dict()
         finally:
+            loop.run_until_complete(http_client.aclose())
             loop.close()
     except Exception as e:
         logger.error("email_verification_failed", email=email, error=str(e))
         raise self.retry(exc=e, countdown=2 ** self.request.retries)
 
 
-async def _verify_batch(emails: list) -> list:
-    """Verify a batch of emails concurrently"""
-    tasks = [email_verifier.verify_email(email) for email in emails]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
+async def _verify_batch(emails: list, depth: str = 'standard', mode: str = 'live') -> list:
+    """Verify a batch of emails through the shared batch engine (grouped by domain)"""
+    options = {'depth': depth, 'mode': mode}
+    if depth in ('syntax', 'dns'):
+        options['concurrency'] = SHALLOW_CONCURRENCY
     final = []
-    for email, res in zip(emails, results):
-        if isinstance(res, Exception):
-            logger.error("batch_email_failed", email=email, error=str(res))
+    try:
+        async for res in email_verifier.verify_many(emails, options):
+            final.append(res)
+    except Exception as e:
+        logger.error("batch_failed", error=str(e))
+    
+    # Input rows the engine did not return (it returns one result per row, duplicates included)
+    returned = Counter(r.get('email', '').lower() for r in final)
+    for email in emails:
+        key = email.strip().lower()
+        if returned[key]:
+            returned[key] -= 1
+        else:
             final.append({
                 "email": email,
-                "error": str(res),
+                "error": "verification did not complete",
                 "final_status": "error",
                 "safety_score": 0
             })
-        else:
-            final.append(res)
     return final
 
 
+async def _verify_phase_major(emails: list, depth: str, record) -> None:
+    """Run the whole list through the phase-major executor, recording results in BATCH_SIZE chunks"""
+    chunk = []
+    async for res in batch_executor.run(emails, {'depth': depth}):
+        chunk.append(res)
+        if len(chunk) >= BATCH_SIZE:
+            record(chunk)
+            chunk = []
+    if chunk:
+        record(chunk)
+
+
+async def _warm_upcoming(emails: list):
+    """Pre-warm SMTP sessions for the next addresses; never fails the job"""
+    try:
+        await smtp_warmer.warm_upcoming(emails)
+    except Exception as e:
+        logger.warning("smtp_warm_failed", error=str(e))
+
+
 def _save_bulk_history(db, user_id: int, results: list, job_id: str):
     """Save a batch of verification results to history"""
     try:
@@ -79,7 +119,8 @@ def _save_bulk_history(db, user_id: int, results: list, job_id: str):
 
 
 @celery_app.task(bind=True, name='app.tasks.process_bulk_job', max_retries=1)
-def process_bulk_job(self, job_id: str, emails: list, user_id: int) -> dict:
+def process_bulk_job(self, job_id: str, emails: list, user_id: int, depth: str = 'standard',
+                     mode: str = 'live') -> dict:
     """Process a bulk email verification job with batched parallelism."""
     db = SessionLocal()
     
@@ -94,30 +135,45 @@ def process_bulk_job(self, job_id: str, emails: list, user_id: int) -> dict:
         
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        warm_task = None
+        # cached_only never touches the network: large batches, no SMTP warming
+        shallow = depth in ('syntax', 'dns') or mode == 'cached_only'
+        batch_size = SHALLOW_BATCH_SIZE if shallow else BATCH_SIZE
+        
+        def record(batch_results: list):
+            nonlocal processed
+            all_results.extend(batch_results)
+            processed += len(batch_results)
+            
+            # Save batch to history
+            _save_bulk_history(db, user_id, batch_results, job_id)
+            
+            # Log progress
+            for res in batch_results:
+                logger.info("bulk_email_verified",
+                           job_id=job_id,
+                           email=res.get('email'),
+                           status=res.get('final_status'))
+            
+            # Update progress
+            job.processed_count = processed
+            job.results = all_results.copy()
+            db.commit()
         
         try:
-            # Process in batches of BATCH_SIZE
-            for i in range(0, len(emails), BATCH_SIZE):
-                batch = emails[i:i + BATCH_SIZE]
-                batch_results = loop.run_until_complete(_verify_batch(batch))
-                
-                all_results.extend(batch_results)
-                processed += len(batch)
-                
-                # Save batch to history
-                _save_bulk_history(db, user_id, batch_results, job_id)
-                
-                # Log progress
-                for res in batch_results:
-                    logger.info("bulk_email_verified",
-                               job_id=job_id,
-                               email=res.get('email'),
-                               status=res.get('final_status'))
-                
-                # Update progress
-                job.processed_count = processed
-                job.results = all_results.copy()
-                db.commit()
+            if len(emails) >= PHASE_MAJOR_THRESHOLD and mode != 'cached_only':
+                # Large lists: each phase runs across the whole job (unique domains, MX groups)
+                loop.run_until_complete(_verify_phase_major(emails, depth, record))
+            else:
+                # Process in batches of batch_size
+                for i in range(0, len(emails), batch_size):
+                    # Warm sessions for upcoming MX hosts while this batch is probed
+                    if not shallow and i % WARM_EVERY == 0 and (warm_task is None or warm_task.done()):
+                        upcoming = emails[i + batch_size:i + batch_size + WARM_LOOKAHEAD]
+                        warm_task = loop.create_task(_warm_upcoming(upcoming))
+                    
+                    batch = emails[i:i + batch_size]
+                    record(loop.run_until_complete(_verify_batch(batch, depth, mode)))
 
             # Mark job as completed
             job.results = all_results
@@ -140,8 +196,9 @@ def process_bulk_job(self, job_id: str, emails: list, user_id: int) -> dict:
                     
                     user = db.query(User).filter(User.id == user_id).first()
                     if user:
-                        valid_count = len([r for r in all_results if r.get('final_status') == 'valid_safe'])
-                        invalid_count = len([r for r in all_results if r.get('final_status') in ['invalid', 'invalid_syntax', 'invalid_domain', 'user_not_found']])
+                        counts = batch_scorer.status_counts(all_results)
+                        valid_count = counts.get('valid_safe', 0)
+                        invalid_count = sum(counts.get(s, 0) for s in INVALID_STATUSES)
                         
                         email_service.send_bulk_job_complete(
                             to=user.email,
@@ -162,6 +219,11 @@ def process_bulk_job(self, job_id: str, emails: list, user_id: int) -> dict:
             }
             
         finally:
+            if warm_task is not None and not warm_task.done():
+                warm_task.cancel()
+                loop.run_until_complete(asyncio.gather(warm_task, return_exceptions=True))
+            smtp_prober.pool.close_all()
+            loop.run_until_complete(http_client.aclose())
             loop.close()
             
     except Exception as e:
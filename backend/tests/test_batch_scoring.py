@@ -0,0 +1,69 @@
+"""
+Batch scoring must match the single-address scoring for every flag combination
+"""
+from collections import Counter
+from itertools import product
+
+import pytest
+
+from app.services import batch_scoring
+from app.services.batch_scoring import SMTP_CODES, BatchScorer
+from app.services.email_verifier import email_verifier
+
+SMTP_OUTCOMES = list(SMTP_CODES) + ['valid', 'unknown', 'no_mx']
+
+
+def _all_results():
+    results = []
+    for disposable, syntax, domain, mx, smtp, catch_all, role, spam_trap in product(
+        (False, True), ('valid', 'invalid'), ('valid', 'invalid'), ('found', 'not_found'),
+        SMTP_OUTCOMES, (False, True), (False, True), (None, 'high'),
+    ):
+        result = email_verifier._new_result('someone@example.com')
+        result.update(disposable=disposable, syntax=syntax, domain=domain, mx=mx, smtp=smtp,
+                      catch_all=catch_all, role_based=role, spam_trap=spam_trap)
+        results.append(result)
+    return results
+
+
+def _expected(result):
+    status, score, reason = email_verifier._calculate_final_status(result)
+    scored = dict(result, safety_score=score)
+    return status, score, reason, email_verifier._assess_spam_risk(scored)
+
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def scorer(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(batch_scoring, 'np', None)
+    return BatchScorer(email_verifier)
+
+
+def test_score_matches_single_address_scoring(scorer):
+    results = _all_results()
+    expected = [_expected(r)[:3] for r in results]
+    assert scorer.score(results) == expected
+
+
+def test_apply_sets_status_score_reason_and_spam_risk(scorer):
+    results = _all_results()
+    expected = [_expected(r) for r in results]
+    scorer.apply(results)
+    actual = [(r['final_status'], r['safety_score'], r['reason'], r['spam_risk']) for r in results]
+    assert actual == expected
+
+
+def test_status_counts(scorer):
+    results = _all_results()
+    scorer.apply(results)
+    results.append({'email': 'x@example.com', 'final_status': 'something_new'})
+    results.append({'email': 'y@example.com'})
+    expected = Counter(str(r.get('final_status')) for r in results)
+    assert scorer.status_counts(results) == dict(expected)
+
+
+def test_empty_batch(scorer):
+    assert scorer.score([]) == []
+    assert scorer.status_counts([]) == {}
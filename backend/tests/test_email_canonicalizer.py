@@ -0,0 +1,69 @@
+"""
+Canonical addresses drive de-duplication and fan-out of bulk jobs
+"""
+import asyncio
+
+import pytest
+
+from app.services.email_canonicalizer import canonicalize_email
+from app.services.email_verifier import email_verifier
+
+
+@pytest.mark.parametrize('email, canonical', [
+    # Gmail ignores dots and +tags
+    ('John.Doe@gmail.com', 'johndoe@gmail.com'),
+    ('j.o.h.n.doe+news@gmail.com', 'johndoe@gmail.com'),
+    ('john.+x@gmail.com', 'john@gmail.com'),
+    # googlemail.com is the same mailbox domain
+    ('john.doe+x@googlemail.com', 'johndoe@gmail.com'),
+    ('John@GoogleMail.COM', 'john@gmail.com'),
+    # Plus addressing on provider domains, including their country domains
+    ('john+x@outlook.com', 'john@outlook.com'),
+    ('john+x@hotmail.fr', 'john@hotmail.fr'),
+    ('john+x@outlook.co.uk', 'john@outlook.co.uk'),
+    ('john.doe+x@outlook.com', 'john.doe@outlook.com'),
+    # ...but not on custom domains that merely start with a provider name
+    ('john+x@outlook.mycorp.de', 'john+x@outlook.mycorp.de'),
+    ('john+x@live.acme.com', 'john+x@live.acme.com'),
+    ('john+x@acme.com', 'john+x@acme.com'),
+    # Dots only matter to Gmail
+    ('john.doe@acme.com', 'john.doe@acme.com'),
+    # Stripping the tag must not leave a malformed address behind
+    ('john.+x@outlook.com', 'john.+x@outlook.com'),
+    # Malformed dot placement is left for syntax validation to reject
+    ('.john@gmail.com', '.john@gmail.com'),
+    ('john.@gmail.com', 'john.@gmail.com'),
+    ('jo..hn+x@gmail.com', 'jo..hn+x@gmail.com'),
+    # Domains: case, trailing root dot, IDN in punycode form
+    ('John@ACME.com.', 'john@acme.com'),
+    ('info@Bücher.de', 'info@xn--bcher-kva.de'),
+    ('info@xn--bcher-kva.de', 'info@xn--bcher-kva.de'),
+    # Local parts are lower-cased, not case-folded
+    ('Straße@acme.com', 'straße@acme.com'),
+    # Not addresses: returned stripped, otherwise unchanged
+    ('  not-an-email ', 'not-an-email'),
+    ('@acme.com', '@acme.com'),
+])
+def test_canonicalize_email(email, canonical):
+    assert canonicalize_email(email) == canonical
+
+
+def test_variants_share_one_key():
+    variants = ['John.Doe@gmail.com', 'johndoe+a@googlemail.com', 'JOHNDOE@GMAIL.COM.']
+    assert {canonicalize_email(v) for v in variants} == {'johndoe@gmail.com'}
+
+
+def test_tag_after_dot_is_valid_in_bulk_and_single_paths():
+    email = 'john.+x@gmail.com'
+
+    async def verify():
+        single = await email_verifier.verify_email(email, depth='syntax')
+        bulk = [r async for r in email_verifier.verify_many([email], {'depth': 'syntax'})]
+        return single, bulk
+
+    single, bulk = asyncio.run(verify())
+    assert single['syntax'] == 'valid'
+    assert len(bulk) == 1
+    assert bulk[0]['email'] == email
+    assert bulk[0]['syntax'] == 'valid'
+    assert bulk[0]['final_status'] == single['final_status']